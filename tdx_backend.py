@@ -12,7 +12,9 @@ Run with::
 """
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
+import hashlib
 import json
 import os
 import uuid
@@ -26,8 +28,10 @@ from zoneinfo import ZoneInfo
 import psycopg2
 import psycopg2.extras as pgx
 from psycopg2.pool import SimpleConnectionPool
-from fastapi import FastAPI, HTTPException, Path, Body, Query
+from fastapi import FastAPI, HTTPException, Path, Body, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
@@ -38,6 +42,15 @@ pgx.register_uuid()
 
 load_dotenv(override=True)
 HOTBOARD_PERF = os.getenv("HOTBOARD_PERF_DEBUG", "0").lower() in {"1", "true", "yes", "on"}
+# /ws/tdx-events 推送循环的数据库检查间隔（秒）
+EVENTS_POLL_SECONDS = float(os.getenv("TDX_EVENTS_POLL_SECONDS", "2"))
+EVENTS_RUNS_WINDOW = 30
+EVENTS_LOGS_BACKLOG = 200
+# /api/ingestion/job/{job_id}/wait 单次最长挂起时间（秒）
+JOB_WAIT_MAX_SECONDS = 25.0
+JOB_TERMINAL_STATUSES = {"success", "failed", "canceled"}
+# 带 X-Idempotency-Key 的 POST 在该时间窗内重复提交时直接回放首个响应
+IDEMPOTENCY_TTL_SECONDS = 30.0
 
 # Global connection pool for this backend process only (web/UI layer).
 # Batch ingestion scripts keep using their own psycopg2 connections.
@@ -402,6 +415,10 @@ def _job_status(job_id: uuid.UUID) -> Dict[str, Any]:
     }
 
 
+def _job_version(job: Dict[str, Any]) -> str:
+    return hashlib.blake2b(_json_dump(job).encode("utf-8"), digest_size=8).hexdigest()
+
+
 def _serialize_testing_run(row: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "run_id": str(row.get("run_id")),
@@ -474,6 +491,48 @@ def get_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # -------------------------- IDEMPOTENCY ---------------------------
+    _idem_lock = threading.Lock()
+    _idem_cache: Dict[tuple, tuple] = {}
+
+    @app.middleware("http")
+    async def _idempotency_guard(request: Request, call_next):
+        key = request.headers.get("x-idempotency-key")
+        if request.method != "POST" or not key:
+            return await call_next(request)
+        cache_key = (request.url.path, key)
+        now = time.monotonic()
+        with _idem_lock:
+            for k in [k for k, v in _idem_cache.items() if v[0] < now]:
+                _idem_cache.pop(k, None)
+            cached = _idem_cache.get(cache_key)
+            if cached is None:
+                # 占位，防止同一 key 的并发请求同时穿透
+                _idem_cache[cache_key] = (now + IDEMPOTENCY_TTL_SECONDS, None, None, None)
+        if cached is not None:
+            _, status, body, media_type = cached
+            if status is None:
+                return JSONResponse({"detail": "duplicate request in progress"}, status_code=409)
+            return Response(content=body, status_code=status, media_type=media_type)
+        try:
+            response = await call_next(request)
+        except Exception:
+            with _idem_lock:
+                _idem_cache.pop(cache_key, None)
+            raise
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        with _idem_lock:
+            if response.status_code < 400:
+                _idem_cache[cache_key] = (now + IDEMPOTENCY_TTL_SECONDS, response.status_code, body, response.media_type)
+            else:
+                _idem_cache.pop(cache_key, None)
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            media_type=response.media_type,
+        )
+
     # ------------------------ HOTBOARD HELPERS ------------------------
     _hotboard_stop = threading.Event()
     _hotboard_threads: List[threading.Thread] = []
@@ -788,6 +847,14 @@ def get_app() -> FastAPI:
         )
         return {"items": [_serialize_schedule(row) for row in rows]}
 
+    @app.get("/api/testing/overview")
+    def testing_overview(runs_limit: int = 50) -> Dict[str, Any]:
+        """Schedules and recent runs in one payload for the testing tab."""
+        return {
+            "schedules": list_testing_schedules()["items"],
+            "runs": list_testing_runs(limit=runs_limit)["items"],
+        }
+
     @app.post("/api/testing/schedule")
     def upsert_testing_schedule(payload: TestingScheduleUpsertRequest) -> Dict[str, Any]:
         schedule_id = payload.schedule_id or uuid.uuid4()
@@ -904,6 +971,28 @@ def get_app() -> FastAPI:
     def get_ingestion_job(job_id: uuid.UUID) -> Dict[str, Any]:
         return _job_status(job_id)
     
+    @app.get("/api/ingestion/job/{job_id}/wait")
+    async def wait_ingestion_job(
+        job_id: uuid.UUID,
+        since_version: Optional[str] = None,
+        timeout: float = JOB_WAIT_MAX_SECONDS,
+    ) -> Dict[str, Any]:
+        """Long-poll variant of ``/api/ingestion/job/{job_id}``.
+
+        Returns as soon as the job payload differs from ``since_version`` (or
+        the job is finished); otherwise waits up to ``timeout`` seconds and
+        returns the unchanged payload. The response carries a ``version``
+        token to pass back on the next call.
+        """
+        deadline = time.monotonic() + min(max(timeout, 0.0), JOB_WAIT_MAX_SECONDS)
+        while True:
+            job = await run_in_threadpool(_job_status, job_id)
+            version = _job_version(job)
+            finished = (job.get("status") or "").lower() in JOB_TERMINAL_STATUSES
+            if version != since_version or finished or time.monotonic() >= deadline:
+                return {**job, "version": version}
+            await asyncio.sleep(1)
+
     @app.get("/api/ingestion/jobs")
     def list_ingestion_jobs(limit: int = 50, active_only: bool = False) -> Dict[str, Any]:
         base_sql = (
@@ -1016,29 +1105,121 @@ def get_app() -> FastAPI:
         return {"run_id": str(run_id), "schedule": _serialize_ingestion_schedule(data)}
 
     @app.get("/api/ingestion/logs")
-    def list_ingestion_logs(limit: int = 50, job_id: Optional[uuid.UUID] = None) -> Dict[str, Any]:
+    def list_ingestion_logs(
+        limit: int = 50,
+        job_id: Optional[uuid.UUID] = None,
+        after: Optional[dt.datetime] = None,
+    ) -> Dict[str, Any]:
+        """List ingestion logs, newest first.
+
+        With ``after`` the call becomes a cursor read: rows at or after the
+        given timestamp are returned, oldest first, so clients can append
+        them to what they already hold. The cursor row itself is included so
+        rows committed later with the same timestamp are not skipped; clients
+        drop the repeats when merging.
+        """
+        where: List[str] = []
+        params: List[Any] = []
         if job_id is not None:
+            where.append("job_id=%s")
+            params.append(job_id)
+        if after is not None:
+            where.append("ts >= %s")
+            params.append(after)
+        sql = (
+            "SELECT job_id, ts, level, message FROM market.ingestion_logs "
+            + (f"WHERE {' AND '.join(where)} " if where else "")
+            + ("ORDER BY ts ASC " if after is not None else "ORDER BY ts DESC ")
+            + "LIMIT %s"
+        )
+        params.append(limit)
+        rows = _fetchall(sql, tuple(params))
+        return {"items": [_serialize_ingestion_log(row) for row in rows]}
+
+    # ------------------------------------------------------------------
+    # Event push endpoint (testing runs + ingestion logs)
+
+    def _collect_events(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return run/log events that changed since the previous call.
+
+        ``state`` is owned by a single WebSocket connection and keeps the last
+        pushed status of each recent run plus the newest log timestamp seen.
+        """
+        events: List[Dict[str, Any]] = []
+        runs = list_testing_runs(limit=EVENTS_RUNS_WINDOW)["items"]
+        seen_runs: Dict[str, Any] = state["runs"]
+        current_runs: Dict[str, Any] = {}
+        for item in reversed(runs):
+            marker = (item.get("status"), item.get("finished_at"))
+            current_runs[item["run_id"]] = marker
+            if seen_runs.get(item["run_id"]) != marker:
+                events.append({"event": "testing_run", "item": item})
+        state["runs"] = current_runs
+
+        if state["log_ts"] is None:
             rows = _fetchall(
                 """
                 SELECT job_id, ts, level, message
                   FROM market.ingestion_logs
-                 WHERE job_id=%s
                  ORDER BY ts DESC
                  LIMIT %s
                 """,
-                (job_id, limit),
+                (EVENTS_LOGS_BACKLOG,),
             )
+            rows.reverse()
         else:
             rows = _fetchall(
                 """
                 SELECT job_id, ts, level, message
                   FROM market.ingestion_logs
-                 ORDER BY ts DESC
+                 WHERE ts > %s
+                 ORDER BY ts ASC
                  LIMIT %s
                 """,
-                (limit,),
+                (state["log_ts"], EVENTS_LOGS_BACKLOG),
             )
-        return {"items": [_serialize_ingestion_log(row) for row in rows]}
+        for row in rows:
+            events.append({"event": "ingestion_log", "item": _serialize_ingestion_log(row)})
+        if rows:
+            state["log_ts"] = rows[-1]["ts"]
+        elif state["log_ts"] is None:
+            state["log_ts"] = dt.datetime.now(dt.timezone.utc)
+        return events
+
+    @app.websocket("/ws/tdx-events")
+    async def tdx_events(websocket: WebSocket) -> None:
+        """Push testing-run and ingestion-log deltas to connected UIs.
+
+        Each text frame is a JSON document ``{"event": ..., "item": {...}}``;
+        the first frames replay the current runs and recent logs so clients
+        can render without an initial REST call, followed by a
+        ``{"event": "snapshot_end"}`` marker.
+
+        Between polls the handler waits on the socket rather than sleeping, so
+        a closed client ends the loop (and its DB polling) within one tick
+        even when there is nothing to push.
+        """
+        await websocket.accept()
+        state: Dict[str, Any] = {"runs": {}, "log_ts": None}
+        snapshot_sent = False
+        try:
+            while True:
+                events = await run_in_threadpool(_collect_events, state)
+                for event in events:
+                    await websocket.send_text(_json_dump(event))
+                if not snapshot_sent:
+                    await websocket.send_text(_json_dump({"event": "snapshot_end"}))
+                    snapshot_sent = True
+                try:
+                    message = await asyncio.wait_for(websocket.receive(), EVENTS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    continue
+                if message.get("type") == "websocket.disconnect":
+                    return
+        except WebSocketDisconnect:
+            return
+        except Exception:  # noqa: BLE001
+            await websocket.close(code=1011)
 
     # ------------------------------------------------------------------
     # Data statistics endpoints (local DB dashboard)
@@ -1,42 +1,92 @@
 from __future__ import annotations
+import hashlib
+import json
 import os
+import re
+import threading
 import time
-from datetime import datetime, timezone
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 import datetime as dt
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 from typing import Any, Dict, List, Optional
 
 import pandas as pd
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+try:
+    # orjson 为可选依赖，缺失时使用标准库 json 解析后端响应
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # websockets 随 uvicorn[standard] 安装；缺失时运行日志页退回 HTTP 拉取
+    from websockets.sync.client import connect as _ws_connect
+except ImportError:
+    _ws_connect = None
+
 load_dotenv(override=True)
 
+
+def _dataset_options(labels: Dict[str, str]) -> Dict[str, str]:
+    """Map dataset key -> selectbox display text ("key · label")."""
+    return {key: f"{key} · {label}" for key, label in labels.items()}
+
+
+# 交易所输入允许逗号或空白分隔，如 "sh,sz" / "sh sz" / "sh, sz"
+_EXCH_SPLIT = re.compile(r"[,\s]+")
+
+
+def _parse_exchanges(text: str) -> List[str]:
+    return [x.lower() for x in _EXCH_SPLIT.split(text.strip()) if x]
+
+
+# 初始化 / 增量页的数据集选项，导入时构建一次
+_INIT_TDX_OPTIONS = _dataset_options({
+    "kline_daily_raw": "日线（未复权 RAW）",
+    "kline_minute_raw": "1 分钟（原始 RAW）",
+})
+_INIT_TS_OPTIONS = _dataset_options({
+    "tdx_board_all": "通达信板块（信息+成分+行情）",
+    "tdx_board_index": "通达信板块信息",
+    "tdx_board_member": "通达信板块成分",
+    "tdx_board_daily": "通达信板块行情",
+    "kline_weekly": "周线（由本地日线QFQ聚合）",
+    "stock_moneyflow": "个股资金流（Tushare moneyflow_ind_dc）",
+    "tushare_trade_cal": "交易日历（Tushare trade_cal 同步）",
+})
+_INCR_TDX_OPTIONS = _dataset_options({
+    "kline_daily_qfq": "日线（前复权 QFQ）",
+    "kline_minute_raw": "1 分钟（原始 RAW）",
+})
+_INCR_TS_OPTIONS = _dataset_options({
+    "tdx_board_all": "通达信板块（信息+成分+行情）",
+    "tdx_board_index": "通达信板块信息",
+    "tdx_board_member": "通达信板块成分",
+    "tdx_board_daily": "通达信板块行情",
+    "stock_moneyflow": "个股资金流（按交易日增量，默认最近3个自然日）",
+    "tushare_trade_cal": "交易日历（Tushare trade_cal 同步）",
+})
+
+
 def _render_init_tab() -> None:
     st.subheader("🚀 初始化同步")
     # 数据源选择放在表单之外，切换时触发重绘
     ds_source = st.selectbox("数据源", options=["TDX", "Tushare"], index=0, key="init_src")
     with st.form("init_form"):
-        if ds_source == "TDX":
-            dataset_labels = {
-                "kline_daily_raw": "日线（未复权 RAW）",
-                "kline_minute_raw": "1 分钟（原始 RAW）",
-            }
-        else:
-            dataset_labels = {
-                "tdx_board_all": "通达信板块（信息+成分+行情）",
-                "tdx_board_index": "通达信板块信息",
-                "tdx_board_member": "通达信板块成分",
-                "tdx_board_daily": "通达信板块行情",
-                "kline_weekly": "周线（由本地日线QFQ聚合）",
-                "stock_moneyflow": "个股资金流（Tushare moneyflow_ind_dc）",
-                "tushare_trade_cal": "交易日历（Tushare trade_cal 同步）",
-            }
+        dataset_options = _INIT_TDX_OPTIONS if ds_source == "TDX" else _INIT_TS_OPTIONS
         dataset = st.selectbox(
             "目标数据集",
-            options=list(dataset_labels.keys()),
-            format_func=lambda k: f"{k} · {dataset_labels[k]}",
+            options=list(dataset_options),
+            format_func=dataset_options.get,
             key=f"init_dataset_{ds_source}"
         )
         col1, col2 = st.columns(2)
@@ -47,7 +97,7 @@ def _render_init_tab() -> None:
                 start_date = st.text_input("开始日期", value=(dt.date.today() - dt.timedelta(days=365)).isoformat())
         with col2:
             end_date = st.text_input("结束日期", value=dt.date.today().isoformat())
-        exchanges = st.text_input("交易所(逗号分隔)", value="sh,sz,bj") if ds_source == "TDX" else ""
+        exchanges = st.text_input("交易所(逗号或空格分隔)", value="sh,sz,bj") if ds_source == "TDX" else ""
         # Tushare 日历专用参数
         cal_exchange = None
         if ds_source == "Tushare" and dataset == "tushare_trade_cal":
@@ -62,14 +112,14 @@ def _render_init_tab() -> None:
                 try:
                     if ds_source == "TDX":
                         opts: Dict[str, Any] = {
-                            "exchanges": [s.strip() for s in exchanges.split(",") if s.strip()],
+                            "exchanges": _parse_exchanges(exchanges),
                             "start_date": start_date,
                             "end_date": end_date,
                             "batch_size": 100,
                             "truncate": bool(truncate),
                         }
                         payload = {"dataset": dataset, "options": opts}
-                        resp = _backend_request("POST", "/api/ingestion/init", json=payload)
+                        resp = _submit_once("init", "/api/ingestion/init", json=payload)
                         # 记录作业 ID，便于下方统一使用 /api/ingestion/job/{job_id} 轮询进度
                         st.session_state["init_job_id"] = resp.get("job_id")
                         st.session_state["init_auto_refresh"] = True
@@ -88,7 +138,7 @@ def _render_init_tab() -> None:
                                 "batch_size": 200,
                             }
                             payload = {"dataset": dataset, "mode": "init", "options": opts}
-                            resp = _backend_request("POST", "/api/ingestion/run", json=payload)
+                            resp = _submit_once("init", "/api/ingestion/run", json=payload)
                             st.session_state["init_job_id"] = resp.get("job_id")
                             st.session_state["init_auto_refresh"] = True
                             st.success("初始化任务已提交")
@@ -96,44 +146,13 @@ def _render_init_tab() -> None:
                 except Exception as exc:  # noqa: BLE001
                     _render_backend_error(exc)
 
-    job_id = st.session_state.get("init_job_id")
-    if job_id:
-        st.markdown(f"当前作业ID：`{job_id}`")
-        try:
-            job = _backend_request("GET", f"/api/ingestion/job/{job_id}")
-            percent = int(job.get("progress") or 0)
-            counters = job.get("counters") or {}
-            colp, colt = st.columns([3, 1])
-            with colp:
-                st.progress(percent / 100.0, text=f"进度 {percent}% · 完成 {counters.get('done', 0)}/{counters.get('total', 0)} · 新增 {counters.get('inserted_rows', 0)} 条")
-                st.caption(
-                    f"总数 {counters.get('total', 0)} · 已完成 {counters.get('done', 0)} · 运行中 {counters.get('running', 0)} · 排队 {counters.get('pending', 0)} · 成功 {counters.get('success', 0)} · 失败 {counters.get('failed', 0)}"
-                )
-                logs = job.get("logs") or []
-                if logs:
-                    st.markdown("最近日志：")
-                    for m in logs:
-                        st.code(str(m))
-            with colt:
-                auto = st.checkbox("自动刷新", value=st.session_state.get("init_auto_refresh", True), key="init_auto_refresh")
-            st.write(job)
-            status = (job.get("status") or "").lower()
-            if status in {"success", "failed", "canceled"}:
-                if status == "success":
-                    st.success("初始化完成")
-                else:
-                    st.error(f"初始化结束，状态：{status}")
-                st.session_state.pop("init_job_id", None)
-            else:
-                if auto:
-                    time.sleep(5)
-                    st.rerun()
-        except Exception as exc:  # noqa: BLE001
-            _render_backend_error(exc)
+    _render_job_panel("init", "初始化完成", "初始化结束", show_raw=True)
 
 """Streamlit UI components for managing TDX testing & ingestion scheduling."""
 
 CHINA_TZ = ZoneInfo("Asia/Shanghai")
+# 上海无夏令时，固定 +08:00 偏移可跳过 ZoneInfo 的逐次规则查找
+_CHINA_TZ_FIXED = timezone(timedelta(hours=8))
 
 FREQUENCY_CHOICES: List[tuple[str, str]] = [
     ("手动 (不调度)", ""),
@@ -145,6 +164,41 @@ FREQUENCY_CHOICES: List[tuple[str, str]] = [
     ("每日", "daily"),
 ]
 
+FREQ_VALUE_TO_LABEL: Dict[str, str] = {value: label for label, value in FREQUENCY_CHOICES}
+FREQ_LABEL_TO_VALUE: Dict[str, str] = dict(FREQUENCY_CHOICES)
+FREQ_LABELS: List[str] = [label for label, _ in FREQUENCY_CHOICES]
+FREQ_VALUES: List[str] = [value for _, value in FREQUENCY_CHOICES]
+
+RUN_COLUMNS: List[str] = ["run_id", "schedule_id", "triggered_by", "status", "started_at", "finished_at", "summary"]
+RUN_COLUMN_LABELS: Dict[str, str] = {
+    "run_id": "执行ID",
+    "schedule_id": "调度",
+    "triggered_by": "发起者",
+    "status": "状态",
+    "started_at": "开始时间",
+    "finished_at": "结束时间",
+    "success": "成功数",
+    "failed": "失败数",
+}
+TIME_COLUMN = st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss", timezone="Asia/Shanghai")
+
+# 作业进度 / 任务监视器自动刷新间隔（秒）
+JOB_POLL_SECONDS = 5
+# 作业状态长轮询的单次等待上限：每次片段运行只等一次，节奏由 run_every 驱动；
+# 等待期间本会话的其他交互会排队，因此保持很短
+JOB_WAIT_SECONDS = 2
+JOB_LOG_TAIL_LINES = 50
+
+# 连续失败达到阈值后，在冷却时间内跳过 GET 请求，避免页面被超时拖住
+BREAKER_FAILURE_THRESHOLD = 2
+BREAKER_COOLDOWN_SECONDS = 10.0
+
+# 运行日志页 WebSocket 推送缓冲区 / 增量日志缓存的长度
+EVENT_BUFFER_SIZE = 200
+# 会话脚本超过该时长未读取推送缓冲区（关闭标签页/离开日志页）时，后台 WebSocket 线程自行退出
+EVENT_LISTENER_IDLE_SECONDS = 120.0
+SESSION_IDLE_SECONDS = 60.0
+
 INGESTION_DATASETS: Dict[str, str] = {
     "kline_daily_qfq": "日线（前复权）",
     "kline_daily_raw": "日线（未复权 RAW）",
@@ -157,12 +211,220 @@ INGESTION_DATASETS: Dict[str, str] = {
     "stock_moneyflow": "个股资金流（moneyflow_ind_dc）",
 }
 
+_DAILY_DATASETS = ("kline_daily_qfq", "kline_daily", "kline_daily_raw")
+# 任务监控分类：(数据集, 模式) 精确匹配优先，其次按数据集匹配，tdx_board_* 前缀单独处理
+_JOB_CATEGORY_MAP: Dict[tuple[str, str], str] = {
+    **{(ds, "init"): "日线初始化" for ds in _DAILY_DATASETS},
+    **{(ds, "incremental"): "日线增量" for ds in _DAILY_DATASETS},
+    ("adjust_daily", "rebuild"): "复权计算",
+    ("adjust_daily", "init"): "复权计算",
+}
+_DATASET_CATEGORY_MAP: Dict[str, str] = {
+    "kline_weekly": "周线聚合",
+    "kline_weekly_qfq": "周线聚合",
+    "stock_moneyflow": "资金流数据",
+}
+_SOURCE_LABEL_MAP: Dict[str, str] = {
+    **{ds: "TDX 日线行情" for ds in _DAILY_DATASETS},
+    "kline_minute_raw": "TDX 分钟行情",
+    "minute_1m": "TDX 分钟行情",
+    "adjust_daily": "Tushare 复权因子",
+    "kline_weekly": "本地周线聚合（日线QFQ）",
+    "kline_weekly_qfq": "本地周线聚合（日线QFQ）",
+    "stock_moneyflow": "Tushare 个股资金流",
+}
+
+
+def _build_session() -> requests.Session:
+    # 复用 keep-alive 连接；重试仅作用于 GET 等幂等请求，POST 不会被重放
+    session = requests.Session()
+    # pool_block=False：连接池耗尽时临时新建连接，而不是让页面重跑阻塞等待
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        pool_block=False,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+_SESSION = _build_session()
+_SESSION_LOCK = threading.Lock()
+_LAST_REQUEST_AT = time.monotonic()
+# 进程级共享线程池，避免每次页面重跑都创建/销毁线程；Session 连接池可安全跨线程复用
+_BACKEND_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tdx-backend")
+
+
+@st.cache_resource
+def _backend_base() -> str:
+    return os.getenv("TDX_BACKEND_BASE", "http://localhost:9000").rstrip("/")
+
+
+class BackendHTTPError(Exception):
+    """Non-2xx response from the backend; the message includes the response body."""
+
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class BackendUnavailable(Exception):
+    """Raised instead of issuing a GET while the backend circuit breaker is open."""
+
+
+def _backend_breaker() -> Dict[str, Any]:
+    return st.session_state.setdefault("backend_breaker", {"failures": 0, "open_until": 0.0})
+
+
+def _check_backend_breaker(method: str) -> None:
+    remaining = _backend_breaker()["open_until"] - time.monotonic()
+    if method == "GET" and remaining > 0:
+        raise BackendUnavailable(f"后端连续请求失败，{remaining:.0f} 秒内暂停读取请求")
+
+
+def _record_backend_result(exc: Optional[Exception]) -> None:
+    breaker = _backend_breaker()
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        breaker["failures"] += 1
+        if breaker["failures"] >= BREAKER_FAILURE_THRESHOLD:
+            breaker["open_until"] = time.monotonic() + BREAKER_COOLDOWN_SECONDS
+    elif exc is None:
+        breaker["failures"] = 0
+        breaker["open_until"] = 0.0
+
+
+def _reset_backend_breaker() -> None:
+    _record_backend_result(None)
+
 
 def _backend_request(method: str, path: str, **kwargs) -> Dict[str, Any]:
-    base = os.getenv("TDX_BACKEND_BASE", "http://localhost:9000").rstrip("/")
-    url = base + path
-    timeout = kwargs.pop("timeout", 30)
-    resp = requests.request(method, url, timeout=timeout, **kwargs)
+    _check_backend_breaker(method)
+    try:
+        resp = _send_request(method, _backend_base() + path, **kwargs)
+    except Exception as exc:  # noqa: BLE001
+        _record_backend_result(exc)
+        raise
+    _record_backend_result(None)
+    if method != "GET":
+        # 写操作成功后只让受影响范围的读缓存失效，随后的重跑立即看到最新的调度与任务
+        _invalidate_backend_get(path)
+    return resp
+
+
+# 读缓存按资源范围（/api/<模块>）带版本号：写操作递增对应版本，其他范围与其他会话的缓存不受影响
+_CACHE_VERSIONS: Dict[str, int] = {}
+_CACHE_VERSIONS_LOCK = threading.Lock()
+# 写入会连带影响其他范围的接口，如复权重建会在 /api/ingestion/jobs 中产生作业
+_EXTRA_SCOPES: Dict[str, tuple[str, ...]] = {
+    "/api/adjust": ("/api/ingestion",),
+}
+
+
+def _cache_scope(path: str) -> str:
+    return "/".join(path.split("/", 3)[:3])
+
+
+def _invalidate_backend_get(*paths: str) -> None:
+    with _CACHE_VERSIONS_LOCK:
+        for path in paths:
+            scope = _cache_scope(path)
+            for name in (scope, *_EXTRA_SCOPES.get(scope, ())):
+                _CACHE_VERSIONS[name] = _CACHE_VERSIONS.get(name, 0) + 1
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _cached_get(url: str, params_key: tuple, timeout: tuple[float, float], version: int = 0) -> Dict[str, Any]:
+    """Raw idempotent GET shared by all sessions; touches no ``st.session_state``.
+
+    ``version`` only takes part in the cache key: bumping a scope's version
+    makes the next read of that scope miss without flushing other entries.
+    """
+    return _send_request("GET", url, params=dict(params_key) or None, timeout=timeout)
+
+
+def _backend_get(path: str, params_key: tuple = (), timeout: tuple[float, float] = (2, 15)) -> Dict[str, Any]:
+    """Cached idempotent GET; short TTL coalesces reruns triggered by unrelated widgets.
+
+    Only the raw HTTP response is cached. The per-session circuit breaker is
+    checked and updated here, outside the cache, so every session sees its
+    own breaker state whether or not its read was a cache hit. Successful
+    writes through ``_backend_request`` invalidate only their own scope, so the
+    rerun after a toggle/save/run refetches exactly once while other paths
+    keep serving cached results.
+    """
+    _check_backend_breaker("GET")
+    version = _CACHE_VERSIONS.get(_cache_scope(path), 0)
+    try:
+        resp = _cached_get(_backend_base() + path, params_key, timeout, version)
+    except Exception as exc:  # noqa: BLE001
+        _record_backend_result(exc)
+        raise
+    _record_backend_result(None)
+    return resp
+
+
+def _params_key(params: Dict[str, Any]) -> tuple:
+    return tuple(sorted(params.items()))
+
+
+def _backend_request_many(specs: List[tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Issue independent backend calls concurrently and return results in order.
+
+    ``specs`` holds ``(method, path, kwargs)`` tuples; the first failure is
+    re-raised so callers keep their usual ``_render_backend_error`` path.
+    Calls share the pooled keep-alive ``_SESSION``, so this gives the same
+    wall-time win as an async client without an event loop inside the
+    Streamlit script thread.
+    """
+    for method, _, _ in specs:
+        _check_backend_breaker(method)
+    base = _backend_base()
+    futures = [_BACKEND_EXECUTOR.submit(_send_request, method, base + path, **kwargs) for method, path, kwargs in specs]
+    try:
+        results = [future.result() for future in futures]
+    except Exception as exc:  # noqa: BLE001
+        # 共享线程池中尚未开始的请求直接取消，不再占用工作线程
+        for future in futures:
+            future.cancel()
+        _record_backend_result(exc)
+        raise
+    _record_backend_result(None)
+    return results
+
+
+def _submit_once(action: str, path: str, **kwargs) -> Dict[str, Any]:
+    """POST a job-creating request guarded by a per-action idempotency key.
+
+    The key is only rotated after a successful call, so a retry or a double
+    click that resends the same key is answered by the backend from its
+    replay cache instead of starting a second job.
+    """
+    nonce_key = f"nonce_{action}"
+    key = st.session_state.setdefault(nonce_key, uuid.uuid4().hex)
+    resp = _backend_request("POST", path, headers={"X-Idempotency-Key": key}, **kwargs)
+    st.session_state[nonce_key] = uuid.uuid4().hex
+    return resp
+
+
+def _recycle_idle_connections() -> None:
+    # 空闲超过 SESSION_IDLE_SECONDS 后丢弃池中旧连接，避免复用已被服务端或 NAT 回收的 socket
+    global _LAST_REQUEST_AT
+    now = time.monotonic()
+    with _SESSION_LOCK:
+        idle = now - _LAST_REQUEST_AT
+        _LAST_REQUEST_AT = now
+    if idle > SESSION_IDLE_SECONDS:
+        _SESSION.close()
+
+
+def _send_request(method: str, url: str, **kwargs) -> Dict[str, Any]:
+    # (连接, 读取) 超时：后端未启动时在连接阶段快速失败
+    timeout = kwargs.pop("timeout", (2, 15))
+    _recycle_idle_connections()
+    resp = _SESSION.request(method, url, timeout=timeout, **kwargs)
     # 遇到错误时，将响应内容一并抛出，便于在页面看到后端返回的 detail
     try:
         resp.raise_for_status()
@@ -173,19 +435,135 @@ def _backend_request(method: str, path: str, **kwargs) -> Dict[str, Any]:
             content = resp.text
         except Exception:  # noqa: BLE001
             content = None
-        raise Exception(f"Backend HTTP {resp.status_code} for {url}: {content}") from exc
+        raise BackendHTTPError(resp.status_code, f"Backend HTTP {resp.status_code} for {url}: {content}") from exc
     if resp.content:
-        return resp.json()
+        return _json_loads(resp.content)
     return {}
 
 
+def _json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _events_url() -> str:
+    base = _backend_base()
+    if base.startswith("https://"):
+        return "wss://" + base[len("https://"):] + "/ws/tdx-events"
+    if base.startswith("http://"):
+        return "ws://" + base[len("http://"):] + "/ws/tdx-events"
+    return base + "/ws/tdx-events"
+
+
+def _event_listener(url: str, listener: Dict[str, Any]) -> None:
+    """Background thread: append pushed runs/logs into the listener deques.
+
+    The thread exits once the owning session stops reading the buffers for
+    ``EVENT_LISTENER_IDLE_SECONDS``, so a closed tab does not keep a socket
+    (and the backend's per-connection DB polling) alive.
+    """
+    stop: threading.Event = listener["stop"]
+    connected: threading.Event = listener["connected"]
+
+    def idle() -> bool:
+        if time.monotonic() - listener["last_read"] > EVENT_LISTENER_IDLE_SECONDS:
+            stop.set()
+        return stop.is_set()
+
+    while not idle():
+        try:
+            with _ws_connect(url, open_timeout=5) as ws:
+                # 每次（重新）连接都会收到完整回放，先清空旧缓冲避免重复
+                listener["runs"].clear()
+                listener["logs"].clear()
+                while not idle():
+                    try:
+                        message = ws.recv(timeout=1)
+                    except TimeoutError:
+                        continue
+                    event = _json_loads(message)
+                    if event.get("event") == "testing_run":
+                        listener["runs"].append(event.get("item") or {})
+                    elif event.get("event") == "ingestion_log":
+                        listener["logs"].append(event.get("item") or {})
+                    elif event.get("event") == "snapshot_end":
+                        # 回放的快照已全部收到，此后页面才改用推送缓冲区渲染
+                        connected.set()
+        except Exception:  # noqa: BLE001
+            connected.clear()
+            stop.wait(5)
+    connected.clear()
+
+
+def _ensure_event_listener() -> Optional[Dict[str, Any]]:
+    if _ws_connect is None:
+        return None
+    listener = st.session_state.get("tdx_event_listener")
+    if listener is not None and listener["thread"].is_alive():
+        # 每次读取视为心跳，线程据此判断会话是否仍在使用
+        listener["last_read"] = time.monotonic()
+        return listener
+    listener = {
+        "runs": deque(maxlen=EVENT_BUFFER_SIZE),
+        "logs": deque(maxlen=EVENT_BUFFER_SIZE),
+        "stop": threading.Event(),
+        "connected": threading.Event(),
+        "last_read": time.monotonic(),
+    }
+    listener["thread"] = threading.Thread(
+        target=_event_listener,
+        args=(_events_url(), listener),
+        name="tdx-events",
+        daemon=True,
+    )
+    listener["thread"].start()
+    st.session_state["tdx_event_listener"] = listener
+    return listener
+
+
+def _stop_event_listener() -> None:
+    listener = st.session_state.pop("tdx_event_listener", None)
+    if listener is not None:
+        listener["stop"].set()
+
+
+def _latest_runs(events: deque[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    # 同一 run 会随状态变化被多次推送，只保留最新一条
+    latest: Dict[Any, Dict[str, Any]] = {}
+    for item in events:
+        latest[item.get("run_id")] = item
+    runs = sorted(latest.values(), key=lambda r: r.get("started_at") or "", reverse=True)
+    return runs[:limit]
+
+
+def _log_key(item: Dict[str, Any]) -> tuple:
+    # 同一作业、同一级别在同一时刻可能写入多条日志，键中带上内容以免合并
+    payload = json.dumps(item.get("payload"), sort_keys=True, ensure_ascii=False, default=str)
+    return item.get("timestamp"), item.get("run_id"), item.get("level"), payload
+
+
+def _merge_log_tail(items: List[Dict[str, Any]], ascending: bool) -> List[Dict[str, Any]]:
+    """Merge fetched log rows into the session tail and return it oldest first.
+
+    Cursor reads include rows at the cursor timestamp again; they map to the
+    same key and are dropped here.
+    """
+    tail: Dict[tuple, Dict[str, Any]] = st.session_state.setdefault("log_tail", {})
+    for item in items if ascending else reversed(items):
+        tail[_log_key(item)] = item
+    while len(tail) > EVENT_BUFFER_SIZE:
+        tail.pop(next(iter(tail)))
+    if tail:
+        st.session_state["log_tail_cursor"] = max(key[0] or "" for key in tail)
+    return list(tail.values())
+
+
 def _frequency_label(value: str) -> str:
-    for label, freq in FREQUENCY_CHOICES:
-        if freq == (value or ""):
-            return label
-    return value or "手动"
+    return FREQ_VALUE_TO_LABEL.get(value or "", value or "手动")
 
 
+@lru_cache(maxsize=4096)
 def _iso(value: Optional[str]) -> str:
     if not value:
         return "—"
@@ -193,12 +571,24 @@ def _iso(value: Optional[str]) -> str:
         dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(CHINA_TZ).strftime("%Y-%m-%d %H:%M:%S")
+        return dt.astimezone(_CHINA_TZ_FIXED).strftime("%Y-%m-%d %H:%M:%S")
     except ValueError:
         return value
 
 
+def _iso_many(values: List[Optional[str]]) -> List[str]:
+    """Vectorised ``_iso`` for a whole column of timestamps."""
+    raw = pd.Series(values, dtype=object)
+    parsed = pd.to_datetime(raw, utc=True, errors="coerce", format="mixed")
+    text = parsed.dt.tz_convert(CHINA_TZ).dt.strftime("%Y-%m-%d %H:%M:%S")
+    # 无法解析的原样展示，空值显示 "—"，与 _iso 保持一致
+    return text.where(parsed.notna(), raw.where(raw.notna() & raw.astype(bool), "—")).tolist()
+
+
 def _render_backend_error(exc: Exception) -> None:
+    if isinstance(exc, BackendUnavailable):
+        st.warning(f"{exc}，可点击“测试连接”立即重试。")
+        return
     if isinstance(exc, requests.exceptions.ConnectionError):
         st.error(
             "无法连接调度服务，请确认后端已启动且地址正确。\n"
@@ -212,26 +602,29 @@ def _render_backend_error(exc: Exception) -> None:
     st.exception(exc)
 
 
+# 数据未变化时直接复用缓存的 DataFrame，避免每次重跑都重新构建
+@st.cache_data(show_spinner=False, max_entries=32)
+def _build_runs_df(runs: List[Dict[str, Any]]) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(runs, columns=RUN_COLUMNS)
+    summary = df.pop("summary")
+    df["success"] = summary.str.get("success")
+    df["failed"] = summary.str.get("failed")
+    df["schedule_id"] = df["schedule_id"].fillna("手动")
+    # 时间列保持 UTC datetime，交由前端按上海时区格式化，省去逐行 _iso 转换
+    for col in ("started_at", "finished_at"):
+        df[col] = pd.to_datetime(df[col], utc=True, errors="coerce")
+    return df.rename(columns=RUN_COLUMN_LABELS)
+
+
 def _render_testing_runs(runs: List[Dict[str, Any]]) -> None:
     if not runs:
         st.info("暂无测试执行记录")
         return
-    df = pd.DataFrame(
-        [
-            {
-                "执行ID": item.get("run_id"),
-                "调度": item.get("schedule_id") or "手动",
-                "发起者": item.get("triggered_by"),
-                "状态": item.get("status"),
-                "开始时间": _iso(item.get("started_at")),
-                "结束时间": _iso(item.get("finished_at")),
-                "成功数": (item.get("summary") or {}).get("success"),
-                "失败数": (item.get("summary") or {}).get("failed"),
-            }
-            for item in runs
-        ]
+    st.dataframe(
+        _build_runs_df(runs),
+        use_container_width=True,
+        column_config={"开始时间": TIME_COLUMN, "结束时间": TIME_COLUMN},
     )
-    st.dataframe(df, use_container_width=True)
 
 
 def _render_incremental_tab() -> None:
@@ -239,24 +632,11 @@ def _render_incremental_tab() -> None:
     # 数据源选择放在表单之外，切换时触发重绘
     ds_source = st.selectbox("数据源", options=["TDX", "Tushare"], index=0, key="incr_src")
     with st.form("incremental_form"):
-        if ds_source == "TDX":
-            dataset_labels = {
-                "kline_daily_qfq": "日线（前复权 QFQ）",
-                "kline_minute_raw": "1 分钟（原始 RAW）",
-            }
-        else:
-            dataset_labels = {
-                "tdx_board_all": "通达信板块（信息+成分+行情）",
-                "tdx_board_index": "通达信板块信息",
-                "tdx_board_member": "通达信板块成分",
-                "tdx_board_daily": "通达信板块行情",
-                "stock_moneyflow": "个股资金流（按交易日增量，默认最近3个自然日）",
-                "tushare_trade_cal": "交易日历（Tushare trade_cal 同步）",
-            }
+        dataset_options = _INCR_TDX_OPTIONS if ds_source == "TDX" else _INCR_TS_OPTIONS
         dataset = st.selectbox(
             "目标数据集",
-            options=list(dataset_labels.keys()),
-            format_func=lambda k: f"{k} · {dataset_labels[k]}",
+            options=list(dataset_options),
+            format_func=dataset_options.get,
             key=f"incr_dataset_{ds_source}"
         )
         col1, col2 = st.columns(2)
@@ -264,7 +644,7 @@ def _render_incremental_tab() -> None:
             date = st.text_input("目标日期", value=dt.date.today().isoformat())
         with col2:
             start_date = st.text_input("覆盖起始日期(可选)", value="")
-        exchanges = st.text_input("交易所(逗号分隔)", value="sh,sz,bj") if ds_source == "TDX" else ""
+        exchanges = st.text_input("交易所(逗号或空格分隔)", value="sh,sz,bj") if ds_source == "TDX" else ""
         # Tushare 日历专用参数
         incr_cal_start = incr_cal_end = None
         incr_cal_exchange = None
@@ -283,11 +663,11 @@ def _render_incremental_tab() -> None:
                     opts: Dict[str, Any] = {
                         "date": date,
                         "start_date": (start_date or None),
-                        "exchanges": [s.strip() for s in exchanges.split(",") if s.strip()],
+                        "exchanges": _parse_exchanges(exchanges),
                         "batch_size": int(batch_size),
                     }
                     payload = {"dataset": dataset, "mode": "incremental", "options": opts}
-                    resp = _backend_request("POST", "/api/ingestion/run", json=payload)
+                    resp = _submit_once("incr", "/api/ingestion/run", json=payload)
                 else:
                     if dataset == "tushare_trade_cal":
                         payload = {"start_date": incr_cal_start, "end_date": incr_cal_end, "exchange": incr_cal_exchange or "SSE"}
@@ -310,7 +690,7 @@ def _render_incremental_tab() -> None:
                             "batch_size": int(batch_size),
                         }
                         payload = {"dataset": dataset, "mode": "incremental", "options": opts}
-                        resp = _backend_request("POST", "/api/ingestion/run", json=payload)
+                        resp = _submit_once("incr", "/api/ingestion/run", json=payload)
                         st.session_state["incr_job_id"] = resp.get("job_id")
                         st.session_state["incr_auto_refresh"] = True
                         st.success("增量任务已提交")
@@ -318,39 +698,7 @@ def _render_incremental_tab() -> None:
             except Exception as exc:  # noqa: BLE001
                 _render_backend_error(exc)
 
-    job_id = st.session_state.get("incr_job_id")
-    if job_id:
-        st.markdown(f"当前作业ID：`{job_id}`")
-        try:
-            job = _backend_request("GET", f"/api/ingestion/job/{job_id}")
-            percent = int(job.get("progress") or 0)
-            counters = job.get("counters") or {}
-            colp, colt = st.columns([3, 1])
-            with colp:
-                st.progress(percent / 100.0, text=f"进度 {percent}% · 完成 {counters.get('done', 0)}/{counters.get('total', 0)} · 新增 {counters.get('inserted_rows', 0)} 条")
-                st.caption(
-                    f"总数 {counters.get('total', 0)} · 已完成 {counters.get('done', 0)} · 运行中 {counters.get('running', 0)} · 排队 {counters.get('pending', 0)} · 成功 {counters.get('success', 0)} · 失败 {counters.get('failed', 0)}"
-                )
-                logs = job.get("logs") or []
-                if logs:
-                    st.markdown("最近日志：")
-                    for m in logs:
-                        st.code(str(m))
-            with colt:
-                auto = st.checkbox("自动刷新", value=st.session_state.get("incr_auto_refresh", True), key="incr_auto_refresh")
-            status = (job.get("status") or "").lower()
-            if status in {"success", "failed", "canceled"}:
-                if status == "success":
-                    st.success("增量更新完成")
-                else:
-                    st.error(f"增量结束，状态：{status}")
-                st.session_state.pop("incr_job_id", None)
-            else:
-                if auto:
-                    time.sleep(5)
-                    st.rerun()
-        except Exception as exc:  # noqa: BLE001
-            _render_backend_error(exc)
+    _render_job_panel("incr", "增量更新完成", "增量结束")
 
 
 def _render_adjust_tab() -> None:
@@ -362,7 +710,7 @@ def _render_adjust_tab() -> None:
             start_date = st.text_input("开始日期", value="1990-01-01")
         with col2:
             end_date = st.text_input("结束日期", value=dt.date.today().isoformat())
-        exchanges = st.text_input("交易所(逗号分隔)", value="sh,sz,bj")
+        exchanges = st.text_input("交易所(逗号或空格分隔)", value="sh,sz,bj")
         workers = st.selectbox("并行度", options=[1, 2, 4, 8], index=0, format_func=lambda x: f"{x} 线程")
         truncate = st.checkbox("生成前清理目标表/范围", value=False)
         confirm = st.checkbox("我已知晓清理数据的风险，并确认继续")
@@ -376,11 +724,11 @@ def _render_adjust_tab() -> None:
                         "which": which,
                         "start_date": start_date,
                         "end_date": end_date,
-                        "exchanges": [s.strip() for s in exchanges.split(",") if s.strip()],
+                        "exchanges": _parse_exchanges(exchanges),
                         "workers": int(workers),
                         "truncate": bool(truncate),
                     }
-                    resp = _backend_request("POST", "/api/adjust/rebuild", json={"options": opts})
+                    resp = _submit_once("adjust", "/api/adjust/rebuild", json={"options": opts})
                     st.session_state["adjust_job_id"] = resp.get("job_id")
                     st.session_state["adjust_auto_refresh"] = True
                     st.success("复权生成任务已提交")
@@ -388,97 +736,166 @@ def _render_adjust_tab() -> None:
                 except Exception as exc:  # noqa: BLE001
                     _render_backend_error(exc)
 
-    job_id = st.session_state.get("adjust_job_id")
-    if job_id:
-        st.markdown(f"当前作业ID：`{job_id}`")
+    _render_job_panel("adjust", "复权生成完成", "复权生成结束")
+
+
+def _render_job_panel(prefix: str, done_text: str, end_text: str, show_raw: bool = False) -> None:
+    """Render the progress panel of the job stored in ``{prefix}_job_id``.
+
+    The status part runs as a fragment so auto refresh reruns only the panel
+    instead of sleeping and rerunning the whole page.
+    """
+    job_id = st.session_state.get(f"{prefix}_job_id")
+    if not job_id:
+        return
+    st.markdown(f"当前作业ID：`{job_id}`")
+    auto = st.checkbox("自动刷新", value=st.session_state.get(f"{prefix}_auto_refresh", True), key=f"{prefix}_auto_refresh")
+    status_fragment = st.fragment(run_every=JOB_POLL_SECONDS if auto else None)(_render_job_status)
+    status_fragment(prefix, job_id, done_text, end_text, show_raw)
+
+
+def _fetch_job(prefix: str, job_id: str) -> Dict[str, Any]:
+    """Long-poll the job until its payload changes, falling back to a plain GET."""
+    version_key = f"{prefix}_job_version"
+    seen_job, seen_version = st.session_state.get(version_key) or (None, None)
+    params: Dict[str, Any] = {"timeout": JOB_WAIT_SECONDS}
+    if seen_job == job_id and seen_version:
+        params["since_version"] = seen_version
+    try:
+        job = _backend_request(
+            "GET",
+            f"/api/ingestion/job/{job_id}/wait",
+            params=params,
+            timeout=(2, JOB_WAIT_SECONDS + 5),
+        )
+    except BackendHTTPError as exc:
+        # 旧版后端没有 /wait 路由
+        if exc.status_code not in {404, 501}:
+            raise
+        return _backend_get(f"/api/ingestion/job/{job_id}")
+    st.session_state[version_key] = (job_id, job.get("version"))
+    return job
+
+
+def _render_job_status(prefix: str, job_id: str, done_text: str, end_text: str, show_raw: bool) -> None:
+    # 进度条与计数使用占位符，每次片段运行原地重绘一次，无需整页重跑
+    progress_slot = st.empty()
+    counters_slot = st.empty()
+    # 已结束的作业直接使用缓存结果，片段后续刷新不再请求后端
+    cached_id, job = st.session_state.get(f"{prefix}_last_job") or (None, {})
+    if cached_id != job_id:
         try:
-            job = _backend_request("GET", f"/api/ingestion/job/{job_id}")
-            percent = int(job.get("progress") or 0)
-            counters = job.get("counters") or {}
-            colp, colt = st.columns([3, 1])
-            with colp:
-                st.progress(percent / 100.0, text=f"进度 {percent}% · 完成 {counters.get('done', 0)}/{counters.get('total', 0)} · 新增 {counters.get('inserted_rows', 0)} 条")
-                st.caption(
-                    f"总数 {counters.get('total', 0)} · 已完成 {counters.get('done', 0)} · 运行中 {counters.get('running', 0)} · 排队 {counters.get('pending', 0)} · 成功 {counters.get('success', 0)} · 失败 {counters.get('failed', 0)}"
-                )
-                logs = job.get("logs") or []
-                if logs:
-                    st.markdown("最近日志：")
-                    for m in logs:
-                        st.code(str(m))
-            with colt:
-                auto = st.checkbox("自动刷新", value=st.session_state.get("adjust_auto_refresh", True), key="adjust_auto_refresh")
-            status = (job.get("status") or "").lower()
-            if status in {"success", "failed", "canceled"}:
-                if status == "success":
-                    st.success("复权生成完成")
-                else:
-                    st.error(f"复权生成结束，状态：{status}")
-                st.session_state.pop("adjust_job_id", None)
-            else:
-                if auto:
-                    time.sleep(5)
-                    st.rerun()
+            job = _fetch_job(prefix, job_id)
         except Exception as exc:  # noqa: BLE001
             _render_backend_error(exc)
+            return
+    _show_job_progress(job, progress_slot, counters_slot)
+    logs = job.get("logs") or []
+    if logs:
+        # 合并为单个代码块，只展示末尾若干行；完整日志放入折叠区
+        st.markdown("最近日志：")
+        st.code("\n".join(str(m) for m in logs[-JOB_LOG_TAIL_LINES:]), language="text")
+        if len(logs) > JOB_LOG_TAIL_LINES:
+            with st.expander(f"完整日志（{len(logs)} 行）", expanded=False):
+                st.code("\n".join(str(m) for m in logs), language="text")
+    if show_raw and st.checkbox("调试：显示原始作业JSON", value=False, key=f"{prefix}_show_raw"):
+        # 进度与日志已在上方展示，这里省略以减少每次刷新传输的数据量
+        st.json({k: v for k, v in job.items() if k not in {"logs", "counters"}}, expanded=False)
+    status = (job.get("status") or "").lower()
+    if status in {"success", "failed", "canceled"}:
+        if status == "success":
+            st.success(done_text)
+        else:
+            st.error(f"{end_text}，状态：{status}")
+        st.session_state[f"{prefix}_last_job"] = (job_id, job)
+        st.session_state.pop(f"{prefix}_job_id", None)
+
+
+def _show_job_progress(job: Dict[str, Any], progress_slot: Any, counters_slot: Any) -> None:
+    percent = int(job.get("progress") or 0)
+    counters = job.get("counters") or {}
+    progress_slot.progress(percent / 100.0, text=f"进度 {percent}% · 完成 {counters.get('done', 0)}/{counters.get('total', 0)} · 新增 {counters.get('inserted_rows', 0)} 条")
+    counters_slot.caption(_counters_caption(counters))
+
+
+_COUNTER_FIELDS = ("total", "done", "running", "pending", "success", "failed")
+
+
+def _counters_caption(counters: Dict[str, Any]) -> str:
+    return _fmt_counters(tuple(counters.get(field, 0) for field in _COUNTER_FIELDS))
+
+
+@lru_cache(maxsize=512)
+def _fmt_counters(values: tuple) -> str:
+    total, done, running, pending, success, failed = values
+    return f"总数 {total} · 已完成 {done} · 运行中 {running} · 排队 {pending} · 成功 {success} · 失败 {failed}"
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name].astype(object)
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def _text_only(series: pd.Series) -> pd.Series:
+    # 非字符串（含 None/NaN）一律置空，便于后续使用 .str 向量化方法
+    return series.where(series.map(lambda v: isinstance(v, str))).astype(object)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _build_ingestion_logs_df(logs: List[Dict[str, Any]]) -> pd.DataFrame:
+    df = pd.json_normalize(logs, max_level=1)
+    summary = _column(df, "payload.summary")
+    summary_dict = summary.where(summary.map(lambda v: isinstance(v, dict)))
+    raw = _text_only(_column(df, "payload.raw"))
+    raw_text = raw.where(raw.str.strip().str.len() > 0)
+
+    dataset = summary_dict.str.get("dataset")
+    # 兼容早期日志：数据集可能存放在 datasets 列表中
+    datasets = summary_dict.str.get("datasets")
+    datasets = datasets.where(datasets.map(lambda v: isinstance(v, list) and len(v) > 0))
+    dataset = dataset.fillna(datasets.str.get(0))
+    # 再次兜底：从原始文本中提取首个词作为任务内容
+    dataset = dataset.fillna(raw_text.str.split().str.get(0))
+    dataset_label = dataset.astype(str).where(dataset.notna(), "—")
+
+    status = _column(df, "payload.status")
+    mode = summary_dict.str.get("mode")
+    mode = mode.where(mode.notna() & mode.astype(bool), status)
+    mode_text = _text_only(mode)
+    has_mode = mode_text.str.len() > 0
+    task_label = (dataset_label + " · " + mode_text.fillna("")).where(has_mode, dataset_label)
+
+    error = _column(df, "payload.error")
+    note = error.astype(str).where(error.notna())
+    note = note.fillna(summary.astype(str).where(summary.notna()))
+    note = note.fillna(raw_text)
+    # 若以上均为空，则尝试从 logs 字段中提取部分错误输出，只展示最后 300 个字符
+    logs_text = _text_only(_column(df, "payload.logs")).str.strip()
+    logs_text = logs_text.where(logs_text.str.len() > 0)
+    snippet = logs_text.where(logs_text.str.len() <= 300, "..." + logs_text.str.slice(-300))
+    note = note.fillna(snippet.where(logs_text.notna()))
+
+    return pd.DataFrame(
+        {
+            "任务内容": task_label,
+            "运行ID": _column(df, "run_id"),
+            "日志时间": pd.to_datetime(_column(df, "timestamp"), utc=True, errors="coerce"),
+            "级别": _column(df, "level"),
+            "数据集": dataset_label,
+            "模式": mode,
+            "状态": status,
+            "备注": note,
+        }
+    )
 
 
 def _render_ingestion_logs(logs: List[Dict[str, Any]]) -> None:
     if not logs:
         st.info("暂无入库日志")
         return
-    rows: List[Dict[str, Any]] = []
-    for item in logs:
-        payload = item.get("payload") or {}
-        summary = payload.get("summary") or {}
-        dataset = summary.get("dataset")
-        # 兼容早期日志：数据集可能存放在 datasets 列表中
-        if dataset is None:
-            datasets = summary.get("datasets")
-            if isinstance(datasets, list) and datasets:
-                dataset = datasets[0]
-        # 再次兜底：从原始文本中提取首个词作为任务内容
-        if dataset is None:
-            raw = payload.get("raw")
-            if isinstance(raw, str) and raw.strip():
-                dataset = raw.split()[0]
-        mode = summary.get("mode") or payload.get("status")
-        dataset_label = str(dataset) if dataset is not None else "—"
-        task_label = dataset_label
-        if isinstance(mode, str) and mode:
-            task_label = f"{dataset_label} · {mode}"
-        note: Optional[str] = None
-        if payload.get("error") is not None:
-            note = str(payload.get("error"))
-        elif payload.get("summary") is not None:
-            note = str(payload.get("summary"))
-        else:
-            raw_val = payload.get("raw")
-            if isinstance(raw_val, str) and raw_val.strip():
-                note = raw_val
-        # 若以上均为空，则尝试从 logs 字段中提取部分错误输出
-        if note is None:
-            logs_text = payload.get("logs")
-            if isinstance(logs_text, str) and logs_text.strip():
-                # 只展示最后 300 个字符，避免页面过长
-                snippet = logs_text.strip()
-                if len(snippet) > 300:
-                    snippet = "..." + snippet[-300:]
-                note = snippet
-        rows.append(
-            {
-                "任务内容": task_label,
-                "运行ID": item.get("run_id"),
-                "日志时间": _iso(item.get("timestamp")),
-                "级别": item.get("level"),
-                "数据集": dataset_label,
-                "模式": mode,
-                "状态": payload.get("status"),
-                "备注": note,
-            }
-        )
-    df = pd.DataFrame(rows)
-    st.dataframe(df, use_container_width=True)
+    df = _build_ingestion_logs_df(logs)
+    st.dataframe(df, use_container_width=True, column_config={"日志时间": TIME_COLUMN})
 
 
 def _render_task_monitor() -> None:
@@ -490,13 +907,18 @@ def _render_task_monitor() -> None:
         limit = st.number_input("最多显示", min_value=10, max_value=200, value=50, step=10, key="monitor_limit")
     with cols[2]:
         auto = st.checkbox("自动刷新", value=st.session_state.get("monitor_auto", True), key="monitor_auto")
+    # 仅在存在运行中任务时按间隔局部刷新任务列表
+    polling = auto and st.session_state.get("monitor_any_active", True)
+    st.fragment(run_every=JOB_POLL_SECONDS if polling else None)(_render_task_list)(bool(active_only), int(limit))
+
+
+def _render_task_list(active_only: bool, limit: int) -> None:
     try:
         with st.spinner("正在加载任务..."):
-            payload = _backend_request(
-                "GET",
+            payload = _backend_get(
                 "/api/ingestion/jobs",
-                params={"limit": int(limit), "active_only": bool(active_only)},
-                timeout=8,
+                _params_key({"limit": limit, "active_only": active_only}),
+                timeout=(2, 8),
             )
             items = payload.get("items", [])
     except Exception as exc:  # noqa: BLE001
@@ -504,135 +926,161 @@ def _render_task_monitor() -> None:
         return
     if not items:
         st.info("暂无任务")
+        _update_monitor_activity(False)
         return
+    # 自动刷新时任务内容常常未变化：按内容签名复用上次整理好的展示文本，只重新输出组件
+    sig = hashlib.blake2b(json.dumps(items, default=str, sort_keys=True).encode(), digest_size=8).hexdigest()
+    cached = st.session_state.get("monitor_views")
+    if cached and cached[0] == sig:
+        views, any_active = cached[1], cached[2]
+    else:
+        views, any_active = _build_job_views(items)
+        st.session_state["monitor_views"] = (sig, views, any_active)
+    for view in views:
+        with st.expander(view["title"], expanded=False):
+            st.caption(view["times"])
+            st.progress(view["percent"] / 100.0, text=view["progress_text"])
+            st.caption(view["counters"])
+            st.caption(view["source"])
+            # 如果有失败任务，展示一小段错误样本（代码 + 日期/范围 + 简要错误信息）
+            if view["errors"]:
+                with st.expander("查看失败明细（样本）", expanded=False):
+                    for line in view["errors"]:
+                        st.markdown(line)
+
+    _update_monitor_activity(any_active)
+
+
+def _build_job_views(items: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], bool]:
+    """Pre-format the task monitor text for each job; returns (views, any_active)."""
+    views: List[Dict[str, Any]] = []
     any_active = False
-    for job in items:
+    started_texts = _iso_many([job.get("started_at") for job in items])
+    created_texts = _iso_many([job.get("created_at") for job in items])
+    for job, started_text, created_text in zip(items, started_texts, created_texts):
         summary = job.get("summary") or {}
         dataset = summary.get("dataset") or (summary.get("datasets") or [None])[0]
         mode = (summary.get("mode") or job.get("job_type") or "").lower()
-        cat = "其他"
-        ds = (dataset or "").lower() if isinstance(dataset, str) else str(dataset)
-        if ds in {"kline_daily_qfq", "kline_daily", "kline_daily_raw"} and mode == "init":
-            cat = "日线初始化"
-        elif ds in {"kline_daily_qfq", "kline_daily", "kline_daily_raw"} and mode == "incremental":
-            cat = "日线增量"
-        elif ds == "adjust_daily" and mode in {"rebuild", "init"}:
-            cat = "复权计算"
-        elif ds.startswith("tdx_board_"):
-            cat = "板块数据"
-        elif ds in {"kline_weekly", "kline_weekly_qfq"}:
-            cat = "周线聚合"
-        elif ds == "stock_moneyflow":
-            cat = "资金流数据"
+        ds = (dataset or "").lower() if isinstance(dataset, str) else str(dataset or "")
+        is_board = ds.startswith("tdx_board_")
+        cat = _JOB_CATEGORY_MAP.get((ds, mode)) or _DATASET_CATEGORY_MAP.get(ds) or ("板块数据" if is_board else "其他")
         percent = int(job.get("progress") or 0)
         counters = job.get("counters") or {}
         error_samples = job.get("error_samples") or []
         status = (job.get("status") or "").lower()
         if status in {"running", "queued", "pending"}:
             any_active = True
-        with st.expander(f"{cat} · 数据集: {dataset or '—'} · 模式: {summary.get('mode') or job.get('job_type') or '—'} · 状态: {job.get('status') or '—'}", expanded=False):
-            st.caption(f"开始时间：{_iso(job.get('started_at'))} · 创建时间：{_iso(job.get('created_at'))}")
-            st.progress(percent / 100.0, text=f"进度 {percent}% · 完成 {counters.get('done', 0)}/{counters.get('total', 0)} · 新增 {counters.get('inserted_rows', 0)} 条")
-            st.caption(
-                f"总数 {counters.get('total', 0)} · 已完成 {counters.get('done', 0)} · 运行中 {counters.get('running', 0)} · 排队 {counters.get('pending', 0)} · 成功 {counters.get('success', 0)} · 失败 {counters.get('failed', 0)}"
-            )
-            # 根据 summary 显示本任务处理的数据来源与范围，便于快速理解任务内容
-            source_label = "—"
-            ds_lower = (dataset or "").lower() if isinstance(dataset, str) else str(dataset or "")
-            if ds_lower in {"kline_daily_qfq", "kline_daily", "kline_daily_raw"}:
-                source_label = "TDX 日线行情"
-            elif ds_lower in {"kline_minute_raw", "minute_1m"}:
-                source_label = "TDX 分钟行情"
-            elif ds_lower == "adjust_daily":
-                source_label = "Tushare 复权因子"
-            elif ds_lower.startswith("tdx_board_"):
-                source_label = "TDX 板块数据"
-            elif ds_lower in {"kline_weekly", "kline_weekly_qfq"}:
-                source_label = "本地周线聚合（日线QFQ）"
-            elif ds_lower == "stock_moneyflow":
-                source_label = "Tushare 个股资金流"
-
-            start_date = summary.get("start_date") or summary.get("start") or summary.get("date_from")
-            end_date = summary.get("end_date") or summary.get("end") or summary.get("date_to")
-            target_date = summary.get("date") or summary.get("target_date")
-            date_range_text: Optional[str]
-            if start_date or end_date:
-                date_range_text = f"{start_date or '—'} .. {end_date or '—'}"
-            elif target_date:
-                date_range_text = str(target_date)
-            else:
-                date_range_text = "—"
+        # 根据 summary 显示本任务处理的数据来源与范围，便于快速理解任务内容
+        source_label = _SOURCE_LABEL_MAP.get(ds) or ("TDX 板块数据" if is_board else "—")
 
-            exchanges_val = summary.get("exchanges")
-            if isinstance(exchanges_val, (list, tuple)):
-                exchanges_text = ",".join(str(x) for x in exchanges_val)
-            elif isinstance(exchanges_val, str):
-                exchanges_text = exchanges_val
-            else:
-                exchanges_text = None
-
-            extra_parts: List[str] = []
-            if exchanges_text:
-                extra_parts.append(f"交易所：{exchanges_text}")
-            if date_range_text and date_range_text != "—":
-                extra_parts.append(f"日期：{date_range_text}")
-            # 复权专用的一些参数
-            which_val = summary.get("which")
-            if which_val:
-                extra_parts.append(f"复权类型：{which_val}")
-            workers_val = summary.get("workers")
-            if workers_val:
-                extra_parts.append(f"并行度：{workers_val}")
-
-            range_text = " · ".join(extra_parts) if extra_parts else "—"
-            st.caption(f"数据源：{source_label} · 数据集：{dataset or '—'} · 范围：{range_text}")
-            # 如果有失败任务，展示一小段错误样本（代码 + 日期/范围 + 简要错误信息）
-            if counters.get("failed", 0) > 0 and error_samples:
-                with st.expander("查看失败明细（样本）", expanded=False):
-                    for err in error_samples:
-                        ts_code = err.get("ts_code") or "—"
-                        detail = err.get("detail") or {}
-                        # detail 中通常包含 code / trade_date 或日期范围
-                        trade_date = None
-                        if isinstance(detail, dict):
-                            trade_date = detail.get("trade_date") or detail.get("date") or detail.get("start_date")
-                        msg = str(err.get("message") or "").strip()
-                        if len(msg) > 200:
-                            msg = msg[:200] + "..."
-                        st.markdown(
-                            f"- 代码：`{ts_code}` · 日期/范围：{trade_date or '未知'}\n  \n  错误：{msg}"
-                        )
-
-
-    if auto and any_active:
-        time.sleep(5)
+        start_date = summary.get("start_date") or summary.get("start") or summary.get("date_from")
+        end_date = summary.get("end_date") or summary.get("end") or summary.get("date_to")
+        target_date = summary.get("date") or summary.get("target_date")
+        date_range_text: Optional[str]
+        if start_date or end_date:
+            date_range_text = f"{start_date or '—'} .. {end_date or '—'}"
+        elif target_date:
+            date_range_text = str(target_date)
+        else:
+            date_range_text = "—"
+
+        exchanges_val = summary.get("exchanges")
+        if isinstance(exchanges_val, (list, tuple)):
+            exchanges_text = ",".join(str(x) for x in exchanges_val)
+        elif isinstance(exchanges_val, str):
+            exchanges_text = exchanges_val
+        else:
+            exchanges_text = None
+
+        extra_parts: List[str] = []
+        if exchanges_text:
+            extra_parts.append(f"交易所：{exchanges_text}")
+        if date_range_text and date_range_text != "—":
+            extra_parts.append(f"日期：{date_range_text}")
+        # 复权专用的一些参数
+        which_val = summary.get("which")
+        if which_val:
+            extra_parts.append(f"复权类型：{which_val}")
+        workers_val = summary.get("workers")
+        if workers_val:
+            extra_parts.append(f"并行度：{workers_val}")
+        range_text = " · ".join(extra_parts) if extra_parts else "—"
+
+        error_lines: List[str] = []
+        if counters.get("failed", 0) > 0:
+            for err in error_samples:
+                ts_code = err.get("ts_code") or "—"
+                detail = err.get("detail") or {}
+                # detail 中通常包含 code / trade_date 或日期范围
+                trade_date = None
+                if isinstance(detail, dict):
+                    trade_date = detail.get("trade_date") or detail.get("date") or detail.get("start_date")
+                msg = str(err.get("message") or "").strip()
+                if len(msg) > 200:
+                    msg = msg[:200] + "..."
+                error_lines.append(f"- 代码：`{ts_code}` · 日期/范围：{trade_date or '未知'}\n  \n  错误：{msg}")
+
+        views.append(
+            {
+                "title": f"{cat} · 数据集: {dataset or '—'} · 模式: {summary.get('mode') or job.get('job_type') or '—'} · 状态: {job.get('status') or '—'}",
+                "times": f"开始时间：{started_text} · 创建时间：{created_text}",
+                "percent": percent,
+                "progress_text": f"进度 {percent}% · 完成 {counters.get('done', 0)}/{counters.get('total', 0)} · 新增 {counters.get('inserted_rows', 0)} 条",
+                "counters": _counters_caption(counters),
+                "source": f"数据源：{source_label} · 数据集：{dataset or '—'} · 范围：{range_text}",
+                "errors": error_lines,
+            }
+        )
+    return views, any_active
+
+
+def _update_monitor_activity(any_active: bool) -> None:
+    if any_active != st.session_state.get("monitor_any_active", True):
+        # 活跃状态变化时整页重跑一次，以开启或停止局部轮询
+        st.session_state["monitor_any_active"] = any_active
         st.rerun()
 
 
+def _fetch_testing_overview(runs_limit: int) -> Dict[str, Any]:
+    try:
+        return _backend_get("/api/testing/overview", _params_key({"runs_limit": runs_limit}), timeout=(2, 8))
+    except BackendHTTPError as exc:
+        # 旧版后端没有 /overview 路由，改为并发请求调度与执行记录
+        if exc.status_code not in {404, 501}:
+            raise
+    schedules, runs = _backend_request_many(
+        [
+            ("GET", "/api/testing/schedule", {"timeout": (2, 8)}),
+            ("GET", "/api/testing/runs", {"params": {"limit": runs_limit}, "timeout": (2, 8)}),
+        ]
+    )
+    return {"schedules": schedules.get("items", []), "runs": runs.get("items", [])}
+
+
 def _render_testing_tab() -> None:
     st.subheader("🧪 TDX 接口自动化测试")
     col_run, col_refresh = st.columns([1, 1])
     with col_run:
         if st.button("立即执行测试", type="primary", key="testing_run_button"):
             try:
-                _backend_request("POST", "/api/testing/run", json={"triggered_by": "ui"})
+                _submit_once("testing_run", "/api/testing/run", json={"triggered_by": "ui"})
                 st.success("测试任务已提交")
                 st.rerun()
             except Exception as exc:  # noqa: BLE001
                 _render_backend_error(exc)
     with col_refresh:
         if st.button("刷新状态", key="testing_refresh_button"):
+            _invalidate_backend_get("/api/testing")
             st.rerun()
 
     try:
         with st.spinner("正在加载测试调度与历史..."):
-            schedules_payload = _backend_request("GET", "/api/testing/schedule", timeout=8)
-            runs_payload = _backend_request("GET", "/api/testing/runs", params={"limit": 50}, timeout=8)
+            overview = _fetch_testing_overview(50)
     except Exception as exc:  # noqa: BLE001
         _render_backend_error(exc)
         return
 
-    schedules = schedules_payload.get("items", [])
+    schedules = overview.get("schedules", [])
     if schedules:
         for item in schedules:
             sched_id = item.get("schedule_id")
@@ -645,19 +1093,20 @@ def _render_testing_tab() -> None:
                     f"- 上次状态：{item.get('last_status') or '—'}\n"
                     f"- 错误信息：{item.get('last_error') or '—'}"
                 )
+                # 展开器折叠时 Streamlit 仍会构建其子组件，表单与按钮仅在打开编辑开关后渲染
+                if not st.toggle("编辑 / 操作", key=f"exp_open_{sched_id}"):
+                    continue
                 with st.form(f"testing_schedule_form_{sched_id}"):
-                    freq_labels = [label for label, _ in FREQUENCY_CHOICES]
-                    freq_values = [value for _, value in FREQUENCY_CHOICES]
                     try:
-                        current_index = freq_values.index(item.get("frequency") or "")
+                        current_index = FREQ_VALUES.index(item.get("frequency") or "")
                     except ValueError:
                         current_index = 0
-                    selected = st.selectbox("调度频率", freq_labels, index=current_index, key=f"freq_{sched_id}")
+                    selected = st.selectbox("调度频率", FREQ_LABELS, index=current_index, key=f"freq_{sched_id}")
                     enabled_flag = st.checkbox("启用调度", value=enabled, key=f"enabled_{sched_id}")
                     submitted = st.form_submit_button("保存")
                     if submitted:
                         try:
-                            freq_value = dict(zip(freq_labels, freq_values))[selected]
+                            freq_value = FREQ_LABEL_TO_VALUE[selected]
                             payload = {
                                 "schedule_id": sched_id,
                                 "frequency": freq_value,
@@ -683,7 +1132,7 @@ def _render_testing_tab() -> None:
                 with cols[1]:
                     if st.button("立即运行", key=f"testing_run_schedule_{sched_id}"):
                         try:
-                            _backend_request("POST", f"/api/testing/schedule/{sched_id}/run")
+                            _submit_once(f"testing_run_{sched_id}", f"/api/testing/schedule/{sched_id}/run")
                             st.success("调度任务已排队")
                             st.rerun()
                         except Exception as exc:  # noqa: BLE001
@@ -693,26 +1142,24 @@ def _render_testing_tab() -> None:
 
     with st.form("testing_schedule_create"):
         st.markdown("#### 新建测试调度")
-        freq_labels = [label for label, _ in FREQUENCY_CHOICES]
-        freq_values = [value for _, value in FREQUENCY_CHOICES]
-        selected = st.selectbox("调度频率", freq_labels, index=1)
+        selected = st.selectbox("调度频率", FREQ_LABELS, index=1)
         enabled_flag = st.checkbox("启用调度", value=True)
         submitted = st.form_submit_button("创建调度")
         if submitted:
             try:
-                freq_value = dict(zip(freq_labels, freq_values))[selected]
+                freq_value = FREQ_LABEL_TO_VALUE[selected]
                 payload = {
                     "frequency": freq_value or "5m",
                     "enabled": enabled_flag,
                 }
-                _backend_request("POST", "/api/testing/schedule", json=payload)
+                _submit_once("testing_schedule_create", "/api/testing/schedule", json=payload)
                 st.success("测试调度已创建")
                 st.rerun()
             except Exception as exc:  # noqa: BLE001
                 _render_backend_error(exc)
 
     st.markdown("### 最近测试执行")
-    _render_testing_runs(runs_payload.get("items", []))
+    _render_testing_runs(overview.get("runs", []))
 
 
 def _render_ingestion_tab() -> None:
@@ -742,7 +1189,7 @@ def _render_ingestion_tab() -> None:
                     "mode": mode,
                     "triggered_by": "ui",
                 }
-                _backend_request("POST", "/api/ingestion/run", json=payload)
+                _submit_once("ingestion_run", "/api/ingestion/run", json=payload)
                 st.success("入库任务已提交")
                 st.rerun()
             except Exception as exc:  # noqa: BLE001
@@ -750,41 +1197,49 @@ def _render_ingestion_tab() -> None:
 
     try:
         with st.spinner("正在加载入库调度..."):
-            schedules_payload = _backend_request("GET", "/api/ingestion/schedule", timeout=8)
+            schedules_payload = _backend_get("/api/ingestion/schedule", timeout=(2, 8))
     except Exception as exc:  # noqa: BLE001
         _render_backend_error(exc)
         return
 
     schedules = schedules_payload.get("items", [])
     if schedules:
+        # 每个调度都会执行的调用绑定为局部变量，调度较多时减少全局/属性查找
+        expander, markdown, toggle = st.expander, st.markdown, st.toggle
+        form, selectbox, checkbox, submit = st.form, st.selectbox, st.checkbox, st.form_submit_button
+        columns, button = st.columns, st.button
+        freq_label, iso = _frequency_label, _iso
         for item in schedules:
             sched_id = item.get("schedule_id")
             dataset = item.get("dataset")
             mode = item.get("mode")
             enabled = item.get("enabled", True)
             label = f"{dataset} · {mode}"
-            with st.expander(f"调度 {sched_id} · {label}"):
-                st.markdown(
-                    f"- 启用状态：{'🟢 启用' if enabled else '⚪️ 停用'}\n"
-                    f"- 调度频率：{_frequency_label(item.get('frequency'))}\n"
-                    f"- 上次运行：{_iso(item.get('last_run_at'))}\n"
-                    f"- 下次运行：{_iso(item.get('next_run_at'))}\n"
-                    f"- 上次状态：{item.get('last_status') or '—'}\n"
-                    f"- 错误信息：{item.get('last_error') or '—'}"
-                )
-                with st.form(f"ingestion_schedule_form_{sched_id}"):
-                    freq_labels = [label for label, _ in FREQUENCY_CHOICES]
-                    freq_values = [value for _, value in FREQUENCY_CHOICES]
+            enabled_icon = "🟢 启用" if enabled else "⚪️ 停用"
+            last_run = iso(item.get("last_run_at"))
+            next_run = iso(item.get("next_run_at"))
+            last_status = item.get("last_status") or "—"
+            last_error = item.get("last_error") or "—"
+            summary_md = (
+                f"- 启用状态：{enabled_icon}\n- 调度频率：{freq_label(item.get('frequency'))}\n"
+                f"- 上次运行：{last_run}\n- 下次运行：{next_run}\n"
+                f"- 上次状态：{last_status}\n- 错误信息：{last_error}"
+            )
+            with expander(f"调度 {sched_id} · {label}"):
+                markdown(summary_md)
+                if not toggle("编辑 / 操作", key=f"ing_exp_open_{sched_id}"):
+                    continue
+                with form(f"ingestion_schedule_form_{sched_id}"):
                     try:
-                        current_index = freq_values.index(item.get("frequency") or "")
+                        current_index = FREQ_VALUES.index(item.get("frequency") or "")
                     except ValueError:
                         current_index = 0
-                    selected = st.selectbox("调度频率", freq_labels, index=current_index, key=f"ing_freq_{sched_id}")
-                    enabled_flag = st.checkbox("启用调度", value=enabled, key=f"ing_enabled_{sched_id}")
-                    submitted = st.form_submit_button("保存")
+                    selected = selectbox("调度频率", FREQ_LABELS, index=current_index, key=f"ing_freq_{sched_id}")
+                    enabled_flag = checkbox("启用调度", value=enabled, key=f"ing_enabled_{sched_id}")
+                    submitted = submit("保存")
                     if submitted:
                         try:
-                            freq_value = dict(zip(freq_labels, freq_values))[selected]
+                            freq_value = FREQ_LABEL_TO_VALUE[selected]
                             payload = {
                                 "schedule_id": sched_id,
                                 "dataset": dataset,
@@ -797,9 +1252,9 @@ def _render_ingestion_tab() -> None:
                             st.rerun()
                         except Exception as exc:  # noqa: BLE001
                             _render_backend_error(exc)
-                cols = st.columns([1, 1, 2])
+                cols = columns([1, 1, 2])
                 with cols[0]:
-                    if st.button("切换启用", key=f"ingestion_toggle_{sched_id}"):
+                    if button("切换启用", key=f"ingestion_toggle_{sched_id}"):
                         try:
                             _backend_request(
                                 "POST",
@@ -810,9 +1265,9 @@ def _render_ingestion_tab() -> None:
                         except Exception as exc:  # noqa: BLE001
                             _render_backend_error(exc)
                 with cols[1]:
-                    if st.button("立即运行", key=f"ingestion_run_schedule_{sched_id}"):
+                    if button("立即运行", key=f"ingestion_run_schedule_{sched_id}"):
                         try:
-                            _backend_request("POST", f"/api/ingestion/schedule/{sched_id}/run")
+                            _submit_once(f"ingestion_run_{sched_id}", f"/api/ingestion/schedule/{sched_id}/run")
                             st.success("调度任务已排队")
                             st.rerun()
                         except Exception as exc:  # noqa: BLE001
@@ -829,21 +1284,19 @@ def _render_ingestion_tab() -> None:
             key="create_dataset",
         )
         mode = st.radio("执行模式", options=["incremental", "init"], horizontal=True, key="create_mode")
-        freq_labels = [label for label, _ in FREQUENCY_CHOICES]
-        freq_values = [value for _, value in FREQUENCY_CHOICES]
-        selected = st.selectbox("调度频率", freq_labels, index=1, key="create_freq")
+        selected = st.selectbox("调度频率", FREQ_LABELS, index=1, key="create_freq")
         enabled_flag = st.checkbox("启用调度", value=True, key="create_enabled")
         submitted = st.form_submit_button("创建调度")
         if submitted:
             try:
-                freq_value = dict(zip(freq_labels, freq_values))[selected]
+                freq_value = FREQ_LABEL_TO_VALUE[selected]
                 payload = {
                     "dataset": dataset,
                     "mode": mode,
                     "frequency": freq_value or "5m",
                     "enabled": enabled_flag,
                 }
-                _backend_request("POST", "/api/ingestion/schedule", json=payload)
+                _submit_once("ingestion_schedule_create", "/api/ingestion/schedule", json=payload)
                 st.success("入库调度已创建")
                 st.rerun()
             except Exception as exc:  # noqa: BLE001
@@ -852,25 +1305,54 @@ def _render_ingestion_tab() -> None:
 
 def _render_logs_tab() -> None:
     st.subheader("📝 执行日志")
-    cols = st.columns([1, 1])
+    cols = st.columns([1, 1, 1])
     with cols[0]:
         logs_limit = st.number_input("日志条数", min_value=10, max_value=200, value=50, step=10)
     with cols[1]:
+        live = st.checkbox("实时推送", value=_ws_connect is not None, disabled=_ws_connect is None, key="logs_live")
+    with cols[2]:
         if st.button("刷新日志", key="refresh_logs"):
+            _invalidate_backend_get("/api/testing", "/api/ingestion")
             st.rerun()
-    try:
-        with st.spinner("正在加载日志..."):
-            testing_runs = _backend_request("GET", "/api/testing/runs", params={"limit": 30}, timeout=8)
-            ingestion_logs = _backend_request("GET", "/api/ingestion/logs", params={"limit": int(logs_limit)}, timeout=8)
-    except Exception as exc:  # noqa: BLE001
-        _render_backend_error(exc)
-        return
+
+    # 游标模式只拉取更新的行，调大条数时无法回补更早的日志；条数变化时清空本地尾部，重新全量加载
+    if st.session_state.get("log_tail_limit") != int(logs_limit):
+        st.session_state["log_tail_limit"] = int(logs_limit)
+        st.session_state.pop("log_tail", None)
+        st.session_state.pop("log_tail_cursor", None)
+
+    listener = _ensure_event_listener() if live else None
+    if not live:
+        _stop_event_listener()
+    if listener is not None and listener["connected"].is_set():
+        # 后端主动推送增量，直接渲染本地缓冲区，无需再请求 /runs 与 /logs
+        testing_items = _latest_runs(listener["runs"], 30)
+        log_items = list(listener["logs"])[-int(logs_limit):][::-1]
+    else:
+        # 日志按时间游标增量拉取，只有新行经过网络，已见过的行保存在 session_state
+        cursor = st.session_state.get("log_tail_cursor")
+        log_params: Dict[str, Any] = {"limit": int(logs_limit)}
+        if cursor:
+            log_params["after"] = cursor
+        try:
+            with st.spinner("正在加载日志..."):
+                testing_runs, ingestion_logs = _backend_request_many(
+                    [
+                        ("GET", "/api/testing/runs", {"params": {"limit": 30}, "timeout": (2, 8)}),
+                        ("GET", "/api/ingestion/logs", {"params": log_params, "timeout": (2, 8)}),
+                    ]
+                )
+        except Exception as exc:  # noqa: BLE001
+            _render_backend_error(exc)
+            return
+        testing_items = testing_runs.get("items", [])
+        log_items = _merge_log_tail(ingestion_logs.get("items", []), ascending=bool(cursor))[-int(logs_limit):][::-1]
 
     st.markdown("### 测试执行记录")
-    _render_testing_runs(testing_runs.get("items", []))
+    _render_testing_runs(testing_items)
 
     st.markdown("### 入库运行日志")
-    _render_ingestion_logs(ingestion_logs.get("items", []))
+    _render_ingestion_logs(log_items)
 
 
 def _render_calendar_tab() -> None:
@@ -898,7 +1380,7 @@ def _render_data_stats_tab() -> None:
     with cols[0]:
         if st.button("刷新统计数据", type="primary", key="data_stats_refresh"):
             try:
-                _backend_request("POST", "/api/data-stats/refresh", timeout=30)
+                _backend_request("POST", "/api/data-stats/refresh", timeout=(2, 30))
                 st.success("统计任务已触发，请稍后查看结果。")
                 st.rerun()
             except Exception as exc:  # noqa: BLE001
@@ -908,7 +1390,7 @@ def _render_data_stats_tab() -> None:
 
     try:
         with st.spinner("正在加载统计数据..."):
-            payload = _backend_request("GET", "/api/data-stats", timeout=15)
+            payload = _backend_request("GET", "/api/data-stats", timeout=(2, 15))
     except Exception as exc:  # noqa: BLE001
         _render_backend_error(exc)
         return
@@ -956,14 +1438,18 @@ def show_local_data_management() -> None:
     """Render the Local Data Management dashboard."""
     st.title("🗄️ 本地数据管理")
     st.caption("集中管理 TDX 接口测试与数据入库调度，支持手动与自动执行。")
-    backend_base = os.getenv("TDX_BACKEND_BASE", "http://localhost:9000")
-    st.info(f"当前调度后端地址：{backend_base}")
+    # 后端地址在进程内缓存；修改 .env 后可通过侧边栏按钮重新读取
+    if st.sidebar.button("重新读取后端地址", key="backend_base_reload"):
+        load_dotenv(override=True)
+        _backend_base.clear()
+    st.info(f"当前调度后端地址：{_backend_base()}")
 
     test_col1, test_col2 = st.columns([1, 3])
     with test_col1:
         if st.button("测试连接", key="backend_ping"):
             try:
-                _backend_request("GET", "/api/testing/schedule", timeout=10)
+                _reset_backend_breaker()
+                _backend_request("GET", "/api/testing/schedule", timeout=(2, 3))
                 st.success("调度后端连接成功。")
             except Exception as exc:  # noqa: BLE001
                 _render_backend_error(exc)
@@ -12,7 +12,6 @@ if sys.platform == 'win32':
         pass
 
 from unified_data_access import UnifiedDataAccess
-import traceback
 
 def test_announcement_data():
     """测试公告数据获取"""
@@ -47,6 +46,7 @@ def test_announcement_data():
                 print(f"  错误: {announcement_data.get('error')}")
     except Exception as e:
         print(f"\n❌ 测试失败: {e}")
+        import traceback
         traceback.print_exc()
 
 
@@ -81,6 +81,7 @@ def test_chip_data():
                 print(f"  错误: {chip_data.get('error')}")
     except Exception as e:
         print(f"\n❌ 测试失败: {e}")
+        import traceback
         traceback.print_exc()
 
 
@@ -6,6 +6,8 @@
 import sys
 import os
 import io
+import asyncio
+from collections import Counter
 
 # 设置Windows控制台UTF-8编码
 if sys.platform == 'win32':
@@ -16,7 +18,17 @@ if sys.platform == 'win32':
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from unified_data_access import UnifiedDataAccess
-import json
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    import json
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
 
 
 def test_announcement_data(symbol, days=30):
@@ -33,13 +45,21 @@ def test_announcement_data(symbol, days=30):
     print(f"时间范围: 最近 {days} 天")
     print("-" * 80)
     
-    # 创建统一数据访问实例
-    unified_data = UnifiedDataAccess()
-    
     # 获取公告数据
     print("\n开始获取公告数据...\n")
-    announcement_data = unified_data.get_announcement_data(symbol, days=days)
-    
+    announcement_data = _fetch_announcement_data(symbol, days)
+    _report_announcement_data(symbol, announcement_data)
+    return announcement_data
+
+
+def _fetch_announcement_data(symbol, days):
+    # 创建统一数据访问实例
+    unified_data = UnifiedDataAccess()
+    return unified_data.get_announcement_data(symbol, days=days)
+
+
+def _report_announcement_data(symbol, announcement_data):
+    """打印公告获取结果并保存JSON"""
     print("\n" + "=" * 80)
     print("📋 获取结果汇总")
     print("=" * 80)
@@ -61,22 +81,26 @@ def test_announcement_data(symbol, days=30):
             print(f"📄 公告列表 (共 {len(announcements)} 条)")
             print("=" * 80)
             
+            # 每条公告先拼成一段文本再一次性写出，减少逐行 print 的开销
             for idx, announcement in enumerate(announcements, 1):
-                print(f"\n【公告 {idx}】")
-                print(f"  日期: {announcement.get('日期', 'N/A')}")
-                print(f"  标题: {announcement.get('公告标题', 'N/A')}")
-                print(f"  类型: {announcement.get('公告类型', 'N/A')}")
+                buf = [
+                    f"\n【公告 {idx}】",
+                    f"  日期: {announcement.get('日期', 'N/A')}",
+                    f"  标题: {announcement.get('公告标题', 'N/A')}",
+                    f"  类型: {announcement.get('公告类型', 'N/A')}",
+                ]
                 
                 if announcement.get('公告摘要'):
                     summary = announcement['公告摘要']
-                    print(f"  摘要: {summary[:100]}{'...' if len(summary) > 100 else ''}")
+                    buf.append(f"  摘要: {summary[:100]}{'...' if len(summary) > 100 else ''}")
                 
-                print("-" * 80)
+                buf.append("-" * 80)
+                sys.stdout.write("\n".join(buf) + "\n")
             
             # 保存到JSON文件
             output_file = f"announcement_data_{symbol}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(announcement_data, f, ensure_ascii=False, indent=2)
+            with open(output_file, 'wb') as f:
+                f.write(_dumps(announcement_data))
             print(f"\n💾 数据已保存到: {output_file}")
             
             # 统计公告类型
@@ -84,13 +108,12 @@ def test_announcement_data(symbol, days=30):
             print("📊 公告类型统计")
             print("=" * 80)
             
-            type_count = {}
-            for announcement in announcements:
-                ann_type = announcement.get('公告类型', 'N/A')
-                type_count[ann_type] = type_count.get(ann_type, 0) + 1
+            type_count = Counter(a.get('公告类型', 'N/A') for a in announcements)
             
-            for ann_type, count in sorted(type_count.items(), key=lambda x: x[1], reverse=True):
-                print(f"  {ann_type}: {count} 条")
+            sys.stdout.write("".join(
+                f"  {ann_type}: {count} 条\n"
+                for ann_type, count in type_count.most_common()
+            ))
         
     else:
         print(f"❌ 获取公告数据失败")
@@ -99,12 +122,26 @@ def test_announcement_data(symbol, days=30):
     print("\n" + "=" * 80)
     print("测试完成")
     print("=" * 80)
-    
-    return announcement_data
 
 
-def test_multiple_stocks():
-    """测试多只股票的公告数据获取"""
+async def _probe_async(sem, symbol, days):
+    async with sem:
+        return await asyncio.to_thread(_fetch_announcement_data, symbol, days)
+
+
+async def _run_all(test_stocks, days=30, concurrency=4):
+    """并发获取多只股票的公告，信号量限制同时在途的请求数"""
+    sem = asyncio.Semaphore(concurrency)
+    tasks = [_probe_async(sem, symbol, days) for symbol, _ in test_stocks]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_multiple_stocks(verbose=True):
+    """测试多只股票的公告数据获取
+
+    Args:
+        verbose: 失败时是否打印完整堆栈；关闭后只在汇总中列出错误信息
+    """
     # 测试股票列表
     test_stocks = [
         ("000001", "平安银行"),
@@ -119,13 +156,18 @@ def test_multiple_stocks():
     
     results = {}
     
-    for symbol, name in test_stocks:
+    # 网络请求并发执行，结果收集完毕后再按顺序打印、写文件
+    fetched = asyncio.run(_run_all(test_stocks, days=30, concurrency=4))
+    
+    for (symbol, name), result in zip(test_stocks, fetched):
         print(f"\n{'#' * 80}")
         print(f"# 测试股票: {name} ({symbol})")
         print(f"{'#' * 80}\n")
         
         try:
-            result = test_announcement_data(symbol, days=30)
+            if isinstance(result, Exception):
+                raise result
+            _report_announcement_data(symbol, result)
             results[symbol] = {
                 'name': name,
                 'success': result.get('data_success', False),
@@ -134,8 +176,9 @@ def test_multiple_stocks():
             }
         except Exception as e:
             print(f"❌ 测试失败: {e}")
-            import traceback
-            traceback.print_exc()
+            if verbose:
+                import traceback
+                traceback.print_exc()
             results[symbol] = {
                 'name': name,
                 'success': False,
@@ -166,6 +209,13 @@ def test_multiple_stocks():
         status = "✅ 成功" if result['success'] else "❌ 失败"
         print(f"{symbol:<10} {result['name']:<15} {status:<10} {result['count']:<10}")
     
+    failed = [(symbol, r) for symbol, r in results.items() if not r['success'] and r['error']]
+    if failed:
+        print("-" * 80)
+        print("失败原因:")
+        for symbol, result in failed:
+            print(f"  {symbol} {result['name']}: {result['error']}")
+    
     print("=" * 80)
 
 
@@ -176,12 +226,13 @@ if __name__ == "__main__":
     parser.add_argument('--symbol', type=str, default='000001', help='股票代码 (默认: 000001)')
     parser.add_argument('--days', type=int, default=30, help='获取最近N天的公告 (默认: 30)')
     parser.add_argument('--batch', action='store_true', help='批量测试多只股票')
+    parser.add_argument('--quiet-tb', action='store_true', help='批量测试时不打印异常堆栈，仅在汇总中列出错误')
     
     args = parser.parse_args()
     
     if args.batch:
         # 批量测试
-        test_multiple_stocks()
+        test_multiple_stocks(verbose=not args.quiet_tb)
     else:
         # 单个测试
         test_announcement_data(args.symbol, args.days)
@@ -5,14 +5,36 @@
 验证数据是否正确获取并填充到stock_info中
 """
 
+import os
 import sys
 import io
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from unified_data_access import unified_data_access
 
+DEBUG_TB = os.getenv('DEBUG_TB') == '1'
+
 # Windows控制台UTF-8编码支持
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+def _call(func, symbol):
+    """调用数据接口，异常作为结果返回，便于在主线程按原格式打印"""
+    try:
+        return func(symbol)
+    except Exception as e:
+        return e
+
+
+def _probe(symbol):
+    stock_info = _call(unified_data_access.get_stock_info, symbol)
+    if isinstance(stock_info, Exception):
+        return symbol, stock_info, None, None
+    beta = _call(unified_data_access.get_beta_coefficient, symbol)
+    week52_data = _call(unified_data_access.get_52week_high_low, symbol)
+    return symbol, stock_info, beta, week52_data
+
+
 def test_beta_and_52week():
     """测试Beta和52周数据获取"""
     print("=" * 60)
@@ -21,67 +43,68 @@ def test_beta_and_52week():
     
     # 测试股票代码（A股）
     test_symbols = ['000001', '600000', '000002']
-    
-    for symbol in test_symbols:
+
+    # 各股票的网络请求互不依赖，并发获取后再按顺序打印
+    with ThreadPoolExecutor(max_workers=len(test_symbols)) as executor:
+        results = list(executor.map(_probe, test_symbols))
+
+    for symbol, stock_info, beta, week52_data in results:
         print(f"\n{'=' * 60}")
         print(f"测试股票: {symbol}")
         print(f"{'=' * 60}")
         
         # 1. 获取stock_info
         print(f"\n[1/2] 获取stock_info...")
-        try:
-            stock_info = unified_data_access.get_stock_info(symbol)
-            
-            # 检查Beta系数
-            print(f"\n  Beta系数:")
-            print(f"    值: {stock_info.get('beta', 'N/A')}")
-            print(f"    类型: {type(stock_info.get('beta', 'N/A'))}")
-            if stock_info.get('beta') != 'N/A':
-                print(f"    ✅ Beta数据获取成功")
-            else:
-                print(f"    ⚠️ Beta数据为N/A（可能Tushare不可用或数据获取失败）")
-            
-            # 检查52周高低位
-            print(f"\n  52周高低位:")
-            print(f"    52周高: {stock_info.get('52_week_high', 'N/A')}")
-            print(f"    52周低: {stock_info.get('52_week_low', 'N/A')}")
-            print(f"    当前价格: {stock_info.get('current_price', 'N/A')}")
-            
-            if stock_info.get('52_week_high') != 'N/A' and stock_info.get('52_week_low') != 'N/A':
-                print(f"    ✅ 52周数据获取成功")
+        if isinstance(stock_info, Exception):
+            print(f"  ❌ 获取stock_info失败: {stock_info}")
+            # 预期错误（如未配置 Tushare Token）只打印异常摘要；DEBUG_TB=1 时输出完整堆栈
+            if DEBUG_TB:
+                traceback.print_exception(type(stock_info), stock_info, stock_info.__traceback__)
             else:
-                print(f"    ⚠️ 52周数据为N/A（可能Tushare不可用或数据获取失败）")
-            
-            # 2. 单独测试Beta系数获取
-            print(f"\n[2/2] 单独测试Beta系数获取方法...")
-            try:
-                beta = unified_data_access.get_beta_coefficient(symbol)
-                if beta is not None:
-                    print(f"    ✅ Beta系数方法返回: {beta:.4f}")
-                else:
-                    print(f"    ⚠️ Beta系数方法返回None")
-            except Exception as e:
-                print(f"    ❌ Beta系数方法调用失败: {e}")
-            
-            # 3. 单独测试52周高低位获取
-            print(f"\n[3/3] 单独测试52周高低位获取方法...")
-            try:
-                week52_data = unified_data_access.get_52week_high_low(symbol)
-                if week52_data and week52_data.get('success'):
-                    print(f"    ✅ 52周数据方法返回成功")
-                    print(f"       高: {week52_data.get('high_52w')}")
-                    print(f"       低: {week52_data.get('low_52w')}")
-                    print(f"       当前: {week52_data.get('current_price')}")
-                    print(f"       位置: {week52_data.get('position_percent'):.1f}%")
-                else:
-                    print(f"    ⚠️ 52周数据方法返回失败: {week52_data.get('success', False) if week52_data else 'None'}")
-            except Exception as e:
-                print(f"    ❌ 52周数据方法调用失败: {e}")
-            
-        except Exception as e:
-            print(f"  ❌ 获取stock_info失败: {e}")
-            import traceback
-            traceback.print_exc()
+                print(''.join(traceback.format_exception_only(type(stock_info), stock_info)))
+            continue
+
+        # 检查Beta系数
+        print(f"\n  Beta系数:")
+        print(f"    值: {stock_info.get('beta', 'N/A')}")
+        print(f"    类型: {type(stock_info.get('beta', 'N/A'))}")
+        if stock_info.get('beta') != 'N/A':
+            print(f"    ✅ Beta数据获取成功")
+        else:
+            print(f"    ⚠️ Beta数据为N/A（可能Tushare不可用或数据获取失败）")
+        
+        # 检查52周高低位
+        print(f"\n  52周高低位:")
+        print(f"    52周高: {stock_info.get('52_week_high', 'N/A')}")
+        print(f"    52周低: {stock_info.get('52_week_low', 'N/A')}")
+        print(f"    当前价格: {stock_info.get('current_price', 'N/A')}")
+        
+        if stock_info.get('52_week_high') != 'N/A' and stock_info.get('52_week_low') != 'N/A':
+            print(f"    ✅ 52周数据获取成功")
+        else:
+            print(f"    ⚠️ 52周数据为N/A（可能Tushare不可用或数据获取失败）")
+        
+        # 2. 单独测试Beta系数获取
+        print(f"\n[2/2] 单独测试Beta系数获取方法...")
+        if isinstance(beta, Exception):
+            print(f"    ❌ Beta系数方法调用失败: {beta}")
+        elif beta is not None:
+            print(f"    ✅ Beta系数方法返回: {beta:.4f}")
+        else:
+            print(f"    ⚠️ Beta系数方法返回None")
+        
+        # 3. 单独测试52周高低位获取
+        print(f"\n[3/3] 单独测试52周高低位获取方法...")
+        if isinstance(week52_data, Exception):
+            print(f"    ❌ 52周数据方法调用失败: {week52_data}")
+        elif week52_data and week52_data.get('success'):
+            print(f"    ✅ 52周数据方法返回成功")
+            print(f"       高: {week52_data.get('high_52w')}")
+            print(f"       低: {week52_data.get('low_52w')}")
+            print(f"       当前: {week52_data.get('current_price')}")
+            print(f"       位置: {week52_data.get('position_percent'):.1f}%")
+        else:
+            print(f"    ⚠️ 52周数据方法返回失败: {week52_data.get('success', False) if week52_data else 'None'}")
     
     print(f"\n{'=' * 60}")
     print("测试完成")
@@ -40,15 +40,20 @@ def check_tushare_interfaces():
     
     print(f"\n[1] 检查stock_basic接口（股票基本信息）")
     try:
-        # 测试查询北交所股票
-        df = ts_api.stock_basic(
-            exchange='',  # 空字符串表示所有交易所
-            list_status='L',
-            fields='ts_code,symbol,name,area,industry,exchange'
-        )
+        # 直接按交易所查询北交所股票，避免拉取全市场后再在本地过滤
+        fields = 'ts_code,symbol,name,area,industry,exchange'
+        bse_stocks = ts_api.stock_basic(exchange='BSE', list_status='L', fields=fields)
+        df = bse_stocks
+        if bse_stocks is None or bse_stocks.empty:
+            # 兜底：部分账户/版本不支持 exchange='BSE'，退回全量查询按 .BJ 后缀筛选
+            df = ts_api.stock_basic(
+                exchange='',  # 空字符串表示所有交易所
+                list_status='L',
+                fields=fields
+            )
+            if df is not None and not df.empty:
+                bse_stocks = df[df['ts_code'].str.endswith('.BJ', na=False)]
         if df is not None and not df.empty:
-            # 查找北交所股票（.BJ结尾）
-            bse_stocks = df[df['ts_code'].str.endswith('.BJ', na=False)]
             if not bse_stocks.empty:
                 print(f"  ✅ 接口可用，找到 {len(bse_stocks)} 只北交所股票")
                 print(f"     示例: {bse_stocks.iloc[0]['ts_code']} - {bse_stocks.iloc[0]['name']}")
@@ -103,53 +108,41 @@ def check_akshare_interfaces():
     """检查AKShare接口对北交所的支持"""
     print_header("AKShare接口检查")
     
-    print(f"\n[1] 检查stock_zh_a_spot_em接口（实时行情-包含京A股）")
-    try:
-        # 检查接口是否存在
-        if hasattr(ak, 'stock_zh_a_spot_em'):
-            print(f"  ✅ 接口存在: stock_zh_a_spot_em")
+    # (接口名, 描述, 说明行)：三个通用接口的检查流程相同，按表驱动
+    probes = [
+        ("stock_zh_a_spot_em", "实时行情-包含京A股", [
+            "注意: 需要网络连接，可能因网络问题无法实际调用",
+            "根据AKShare文档，此接口应包含'京A股'数据",
+        ]),
+        ("stock_individual_info_em", "个股信息", [
+            "说明: 此接口支持通过symbol参数查询个股信息",
+            "      应支持北交所股票代码（8或4开头）",
+        ]),
+        ("stock_zh_a_hist", "历史行情", [
+            "说明: 此接口应支持A股历史数据，包括北交所",
+        ]),
+    ]
+    for idx, (name, desc, notes) in enumerate(probes, 1):
+        print(f"\n[{idx}] 检查{name}接口（{desc}）")
+        try:
+            fn = getattr(ak, name, None)
+            if fn is None:
+                print(f"  ❌ 接口不存在")
+                continue
+            print(f"  ✅ 接口存在: {name}")
             # 查看接口签名
-            sig = inspect.signature(ak.stock_zh_a_spot_em)
-            print(f"     参数: {list(sig.parameters.keys())}")
-            
-            # 尝试调用（可能因网络问题失败）
-            print(f"     注意: 需要网络连接，可能因网络问题无法实际调用")
-            print(f"     根据AKShare文档，此接口应包含'京A股'数据")
-        else:
-            print(f"  ❌ 接口不存在")
-    except Exception as e:
-        print(f"  ⚠️ 检查失败: {str(e)}")
-    
-    print(f"\n[2] 检查stock_individual_info_em接口（个股信息）")
-    try:
-        if hasattr(ak, 'stock_individual_info_em'):
-            print(f"  ✅ 接口存在: stock_individual_info_em")
-            sig = inspect.signature(ak.stock_individual_info_em)
+            sig = inspect.signature(fn)
             print(f"     参数: {list(sig.parameters.keys())}")
-            print(f"     说明: 此接口支持通过symbol参数查询个股信息")
-            print(f"           应支持北交所股票代码（8或4开头）")
-        else:
-            print(f"  ❌ 接口不存在")
-    except Exception as e:
-        print(f"  ⚠️ 检查失败: {str(e)}")
-    
-    print(f"\n[3] 检查stock_zh_a_hist接口（历史行情）")
-    try:
-        if hasattr(ak, 'stock_zh_a_hist'):
-            print(f"  ✅ 接口存在: stock_zh_a_hist")
-            sig = inspect.signature(ak.stock_zh_a_hist)
-            print(f"     参数: {list(sig.parameters.keys())}")
-            print(f"     说明: 此接口应支持A股历史数据，包括北交所")
-        else:
-            print(f"  ❌ 接口不存在")
-    except Exception as e:
-        print(f"  ⚠️ 检查失败: {str(e)}")
+            for note in notes:
+                print(f"     {note}")
+        except Exception as e:
+            print(f"  ⚠️ 检查失败: {str(e)}")
     
     print(f"\n[4] 检查北交所专用接口")
     # 搜索AKShare中可能存在的北交所相关接口
-    ak_methods = [name for name in dir(ak) if 'stock' in name.lower() and 'bj' in name.lower()]
-    ak_methods += [name for name in dir(ak) if 'stock' in name.lower() and 'beijing' in name.lower()]
-    ak_methods += [name for name in dir(ak) if 'stock' in name.lower() and '京' in name]
+    # dir(ak) 只取一次，单次遍历同时匹配 bj / beijing / 京
+    names = [name for name in dir(ak) if 'stock' in name.lower()]
+    ak_methods = [name for name in names if 'bj' in name.lower() or 'beijing' in name.lower() or '京' in name]
     
     if ak_methods:
         print(f"  找到可能的北交所相关接口:")
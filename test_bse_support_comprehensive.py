@@ -9,9 +9,16 @@
 
 import sys
 import io
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import lru_cache, wraps
 import pandas as pd
+import requests
 import traceback
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # 设置UTF-8编码输出（Windows兼容）
 if sys.platform == 'win32':
@@ -23,15 +30,46 @@ import akshare as ak
 from data_source_manager import data_source_manager
 from unified_data_access import UnifiedDataAccess
 from debug_logger import debug_logger
+from tushare_test_cache import cached_call, parse_cache_flag
+
+# 共享的连接池 Session：akshare / tushare 内部直接调用 requests.get / requests.post，
+# 每次调用都会新建连接；测试期间把这两个入口指向同一个 Session 以复用 keep-alive 连接
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+SESSION.mount('https://', _ADAPTER)
+SESSION.mount('http://', _ADAPTER)
+
+
+@contextmanager
+def _shared_session():
+    orig_get, orig_post = requests.get, requests.post
+    requests.get, requests.post = SESSION.get, SESSION.post
+    try:
+        yield SESSION
+    finally:
+        requests.get, requests.post = orig_get, orig_post
+
 
 # 北交所测试股票列表
-BSE_TEST_STOCKS = [
+BSE_TEST_STOCKS = (
     "830001",  # 大地股份
     "832149",  # 利尔达
     "830946",  # 森萱医药
     "830779",  # 武汉蓝电
     "430047",  # 诺思兰德（4开头）
-]
+)
+# 对应的Tushare代码，与 BSE_TEST_STOCKS 一一对应
+BSE_TS_CODES = tuple(f"{symbol}.BJ" for symbol in BSE_TEST_STOCKS)
+
+def _date_range(days: int, now: datetime = None):
+    """返回 (start_date, end_date)，格式 YYYYMMDD"""
+    now = now or datetime.now()
+    return (now - timedelta(days=days)).strftime('%Y%m%d'), now.strftime('%Y%m%d')
+
 
 def print_header(title: str):
     """打印标题"""
@@ -40,132 +78,210 @@ def print_header(title: str):
     print(f"{'='*80}")
 
 
-def test_tushare_basic_info(symbol: str):
+# 接口响应的本地磁盘缓存（tushare_test_cache）：重复运行测试时跳过网络请求，--no-cache 可跳过
+TTL_SPOT = 3600             # 实时行情 1 小时
+TTL_HISTORY = 24 * 3600     # 历史/财务数据 24 小时
+TTL_BASIC = 7 * 24 * 3600   # 股票基本信息 7 天
+
+
+@lru_cache(maxsize=1)
+def _spot_snapshot():
+    """全市场实时行情快照（按代码建索引），整个测试过程只下载一次
+
+    需要最新数据时调用 _spot_snapshot.cache_clear()
+    """
+    df_all = cached_call('stock_zh_a_spot_em', ak.stock_zh_a_spot_em, TTL_SPOT)
+    if df_all is None or df_all.empty:
+        return df_all
+    return df_all.set_index('代码', drop=False)
+
+
+def _cell(df: pd.DataFrame, column: str, pos: int):
+    """按位置取单个值（列或行缺失时返回 'N/A'），避免为取一个字段构造整行 Series"""
+    if column in df.columns and len(df):
+        return df[column].iat[pos]
+    return 'N/A'
+
+
+def _spot_rows(snap: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    return snap.loc[[symbol]] if symbol in snap.index else snap.iloc[0:0]
+
+
+def _probe(label: str):
+    """探测装饰器：统一计时、异常捕获与“成功/空数据”判定
+
+    被装饰函数只负责发起接口调用并返回 DataFrame；包装后返回
+    {"success", "label", "elapsed", "data", "reason"} 结构的结果字典。
+    """
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                df = fn(*args, **kwargs)
+            except Exception as e:
+                return {"success": False, "label": label, "elapsed": time.perf_counter() - start,
+                        "data": None, "reason": f"{type(e).__name__}: {e}"}
+            ok = df is not None and not getattr(df, 'empty', False)
+            return {"success": ok, "label": label, "elapsed": time.perf_counter() - start,
+                    "data": df if ok else None, "reason": None if ok else "返回空数据"}
+        return wrapper
+    return deco
+
+
+@_probe("tushare.stock_basic")
+def _tushare_stock_basic(ts_code: str):
+    return cached_call(
+        'stock_basic',
+        data_source_manager.tushare_api.stock_basic,
+        TTL_BASIC,
+        ts_code=ts_code,
+        exchange='',
+        list_status='L',
+        fields='ts_code,symbol,name,area,industry,list_date'
+    )
+
+
+@_probe("tushare.daily")
+def _tushare_daily(ts_code: str, start_date: str, end_date: str):
+    return cached_call(
+        'daily',
+        data_source_manager.tushare_api.daily,
+        TTL_HISTORY,
+        ts_code=ts_code,
+        start_date=start_date,
+        end_date=end_date
+    )
+
+
+def _print_probe_failure(result):
+    if result["reason"] == "返回空数据":
+        print(f"  ⚠️ 返回空数据")
+    else:
+        print(f"  ❌ 获取失败: {result['reason']}")
+
+
+def test_tushare_basic_info(symbol: str, ts_code: str = None):
     """测试Tushare获取北交所股票基本信息"""
     print(f"\n[测试] Tushare - 基本信息 ({symbol})")
-    try:
-        ts_code = f"{symbol}.BJ"
-        print(f"  转换后的ts_code: {ts_code}")
-        
-        if not data_source_manager.tushare_available:
-            print(f"  ❌ Tushare未初始化")
-            return {"success": False, "reason": "Tushare未初始化"}
-        
-        # 测试stock_basic接口
-        try:
-            df = data_source_manager.tushare_api.stock_basic(
-                ts_code=ts_code,
-                exchange='',
-                list_status='L',
-                fields='ts_code,symbol,name,area,industry,list_date'
-            )
-            if df is not None and not df.empty:
-                print(f"  ✅ 成功获取基本信息")
-                print(f"     {df.to_dict('records')[0]}")
-                return {"success": True, "data": df}
-            else:
-                print(f"  ⚠️ 返回空数据")
-                return {"success": False, "reason": "返回空数据"}
-        except Exception as e:
-            error_msg = str(e)
-            print(f"  ❌ 获取失败: {error_msg}")
-            return {"success": False, "reason": error_msg}
-    except Exception as e:
-        print(f"  ❌ 异常: {type(e).__name__} - {str(e)}")
-        return {"success": False, "reason": str(e)}
+    ts_code = ts_code or f"{symbol}.BJ"
+    print(f"  转换后的ts_code: {ts_code}")
+    
+    if not data_source_manager.tushare_available:
+        print(f"  ❌ Tushare未初始化")
+        return {"success": False, "reason": "Tushare未初始化"}
+    
+    # 测试stock_basic接口
+    result = _tushare_stock_basic(ts_code)
+    if result["success"]:
+        print(f"  ✅ 成功获取基本信息 ({result['elapsed']:.2f}s)")
+        print(f"     {result['data'].iloc[0].to_dict()}")
+    else:
+        _print_probe_failure(result)
+    return result
 
 
-def test_tushare_daily_data(symbol: str):
+def test_tushare_daily_data(symbol: str, start_date: str = None, end_date: str = None, ts_code: str = None):
     """测试Tushare获取北交所股票日线数据"""
     print(f"\n[测试] Tushare - 日线数据 ({symbol})")
-    try:
-        ts_code = f"{symbol}.BJ"
-        end_date = datetime.now().strftime('%Y%m%d')
-        start_date = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
-        
-        if not data_source_manager.tushare_available:
-            print(f"  ❌ Tushare未初始化")
-            return {"success": False, "reason": "Tushare未初始化"}
-        
-        try:
-            df = data_source_manager.tushare_api.daily(
-                ts_code=ts_code,
-                start_date=start_date,
-                end_date=end_date
-            )
-            if df is not None and not df.empty:
-                print(f"  ✅ 成功获取日线数据: {len(df)} 条")
-                print(f"     最新收盘价: {df.iloc[0]['close'] if len(df) > 0 else 'N/A'}")
-                return {"success": True, "count": len(df), "data": df}
-            else:
-                print(f"  ⚠️ 返回空数据")
-                return {"success": False, "reason": "返回空数据"}
-        except Exception as e:
-            error_msg = str(e)
-            print(f"  ❌ 获取失败: {error_msg}")
-            return {"success": False, "reason": error_msg}
-    except Exception as e:
-        print(f"  ❌ 异常: {type(e).__name__} - {str(e)}")
-        return {"success": False, "reason": str(e)}
+    ts_code = ts_code or f"{symbol}.BJ"
+    if not (start_date and end_date):
+        start_date, end_date = _date_range(30)
+    
+    if not data_source_manager.tushare_available:
+        print(f"  ❌ Tushare未初始化")
+        return {"success": False, "reason": "Tushare未初始化"}
+    
+    result = _tushare_daily(ts_code, start_date, end_date)
+    if result["success"]:
+        df = result["data"]
+        result["count"] = len(df)
+        print(f"  ✅ 成功获取日线数据: {len(df)} 条 ({result['elapsed']:.2f}s)")
+        print(f"     最新收盘价: {_cell(df, 'close', 0)}")
+    else:
+        _print_probe_failure(result)
+    return result
 
 
-def test_akshare_spot_data(symbol: str):
+def _spot_method_1(symbol: str):
+    """方法1: 使用stock_zh_a_spot_em（包含京A股）；返回 (结果或None, 输出行)"""
+    snap = _spot_snapshot()
+    if snap is None or snap.empty:
+        return None, [f"  ⚠️ 方法1: 返回空数据"]
+    df_stock = _spot_rows(snap, symbol)
+    if df_stock.empty:
+        return None, [f"  ⚠️ 方法1: 未在实时行情中找到该股票"]
+    return {"success": True, "method": "stock_zh_a_spot_em", "data": df_stock}, [
+        f"  ✅ 方法1(stock_zh_a_spot_em)成功: 找到股票数据",
+        f"     名称: {_cell(df_stock, '名称', 0)}",
+        f"     最新价: {_cell(df_stock, '最新价', 0)}",
+    ]
+
+
+def _spot_method_2(symbol: str):
+    """方法2: 使用stock_individual_info_em（个股信息）"""
+    df_info = cached_call(
+        'stock_individual_info_em', ak.stock_individual_info_em, TTL_HISTORY, symbol=symbol
+    )
+    if df_info is None or df_info.empty:
+        return None, [f"  ⚠️ 方法2: 返回空数据"]
+    return {"success": True, "method": "stock_individual_info_em", "data": df_info}, [
+        f"  ✅ 方法2(stock_individual_info_em)成功",
+        f"     字段数: {len(df_info)}",
+    ]
+
+
+def _spot_method_3(symbol: str, start_date: str, end_date: str):
+    """方法3: 使用stock_zh_a_hist（历史行情）"""
+    df_hist = cached_call(
+        'stock_zh_a_hist',
+        ak.stock_zh_a_hist,
+        TTL_HISTORY,
+        symbol=symbol,
+        period="daily",
+        start_date=start_date,
+        end_date=end_date,
+        adjust=""
+    )
+    if df_hist is None or df_hist.empty:
+        return None, [f"  ⚠️ 方法3: 返回空数据"]
+    return {"success": True, "method": "stock_zh_a_hist", "count": len(df_hist), "data": df_hist}, [
+        f"  ✅ 方法3(stock_zh_a_hist)成功: {len(df_hist)} 条数据",
+        f"     最新收盘价: {_cell(df_hist, '收盘', -1)}",
+    ]
+
+
+def test_akshare_spot_data(symbol: str, start_date: str = None, end_date: str = None):
     """测试AKShare获取北交所股票实时行情"""
     print(f"\n[测试] AKShare - 实时行情 ({symbol})")
+    if not (start_date and end_date):
+        start_date, end_date = _date_range(30)
     try:
         from network_optimizer import network_optimizer
         
-        with network_optimizer.apply():
-            # 方法1: 使用stock_zh_a_spot_em（包含京A股）
-            try:
-                df_all = ak.stock_zh_a_spot_em()
-                if df_all is not None and not df_all.empty:
-                    df_stock = df_all[df_all['代码'] == symbol]
-                    if not df_stock.empty:
-                        print(f"  ✅ 方法1(stock_zh_a_spot_em)成功: 找到股票数据")
-                        print(f"     名称: {df_stock.iloc[0].get('名称', 'N/A')}")
-                        print(f"     最新价: {df_stock.iloc[0].get('最新价', 'N/A')}")
-                        return {"success": True, "method": "stock_zh_a_spot_em", "data": df_stock}
-                    else:
-                        print(f"  ⚠️ 方法1: 未在实时行情中找到该股票")
-                else:
-                    print(f"  ⚠️ 方法1: 返回空数据")
-            except Exception as e:
-                print(f"  ⚠️ 方法1失败: {str(e)}")
-            
-            # 方法2: 使用stock_individual_info_em（个股信息）
-            try:
-                df_info = ak.stock_individual_info_em(symbol=symbol)
-                if df_info is not None and not df_info.empty:
-                    print(f"  ✅ 方法2(stock_individual_info_em)成功")
-                    print(f"     字段数: {len(df_info)}")
-                    return {"success": True, "method": "stock_individual_info_em", "data": df_info}
-                else:
-                    print(f"  ⚠️ 方法2: 返回空数据")
-            except Exception as e:
-                print(f"  ⚠️ 方法2失败: {str(e)}")
-            
-            # 方法3: 使用stock_zh_a_hist（历史行情）
-            try:
-                end_date = datetime.now().strftime('%Y%m%d')
-                start_date = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
-                df_hist = ak.stock_zh_a_hist(
-                    symbol=symbol,
-                    period="daily",
-                    start_date=start_date.replace('-', ''),
-                    end_date=end_date.replace('-', ''),
-                    adjust=""
+        # 三种方法同时发起，按方法顺序取第一个非空结果（与原先的优先级一致）：
+        # 方法1成功时只需等待它本身，其余请求不再等待
+        executor = ThreadPoolExecutor(max_workers=3)
+        try:
+            with network_optimizer.apply():
+                futures = (
+                    executor.submit(_spot_method_1, symbol),
+                    executor.submit(_spot_method_2, symbol),
+                    executor.submit(_spot_method_3, symbol, start_date, end_date),
                 )
-                if df_hist is not None and not df_hist.empty:
-                    print(f"  ✅ 方法3(stock_zh_a_hist)成功: {len(df_hist)} 条数据")
-                    print(f"     最新收盘价: {df_hist.iloc[-1].get('收盘', 'N/A') if len(df_hist) > 0 else 'N/A'}")
-                    return {"success": True, "method": "stock_zh_a_hist", "count": len(df_hist), "data": df_hist}
-                else:
-                    print(f"  ⚠️ 方法3: 返回空数据")
-            except Exception as e:
-                print(f"  ⚠️ 方法3失败: {str(e)}")
-            
-            return {"success": False, "reason": "所有方法均失败"}
+                for method_no, future in enumerate(futures, start=1):
+                    try:
+                        result, lines = future.result()
+                    except Exception as e:
+                        result, lines = None, [f"  ⚠️ 方法{method_no}失败: {str(e)}"]
+                    print("\n".join(lines))
+                    if result is not None:
+                        return result
+        finally:
+            # 在代理上下文之外释放线程池，不等待仍在进行的慢请求
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return {"success": False, "reason": "所有方法均失败"}
     except Exception as e:
         error_msg = str(e)
         print(f"  ❌ 异常: {type(e).__name__} - {error_msg}")
@@ -173,64 +289,66 @@ def test_akshare_spot_data(symbol: str):
         return {"success": False, "reason": error_msg}
 
 
+# (结果键, 报表名称, AKShare 接口名)
+FINANCIAL_STATEMENTS = (
+    ("balance_sheet", "资产负债表", "stock_balance_sheet_by_report_em"),
+    ("income_statement", "利润表", "stock_profit_sheet_by_report_em"),
+    ("cashflow", "现金流量表", "stock_cash_flow_sheet_by_report_em"),
+)
+
+
 def test_akshare_financial_data(symbol: str):
-    """测试AKShare获取北交所股票财务数据"""
+    """测试AKShare获取北交所股票财务数据（三张报表并发获取，分别记录结果）"""
     print(f"\n[测试] AKShare - 财务数据 ({symbol})")
     try:
         from network_optimizer import network_optimizer
         
         with network_optimizer.apply():
-            # 测试资产负债表（北交所）
-            try:
-                df_balance = ak.stock_balance_sheet_by_report_em(
-                    symbol=symbol
-                )
-                if df_balance is not None and not df_balance.empty:
-                    print(f"  ✅ 资产负债表成功: {len(df_balance)} 条")
-                    return {"success": True, "type": "balance_sheet", "count": len(df_balance)}
-                else:
-                    print(f"  ⚠️ 资产负债表为空")
-            except Exception as e:
-                print(f"  ⚠️ 资产负债表失败: {str(e)}")
-            
-            # 测试利润表
-            try:
-                df_income = ak.stock_profit_sheet_by_report_em(
-                    symbol=symbol
-                )
-                if df_income is not None and not df_income.empty:
-                    print(f"  ✅ 利润表成功: {len(df_income)} 条")
-                    return {"success": True, "type": "income_statement", "count": len(df_income)}
-                else:
-                    print(f"  ⚠️ 利润表为空")
-            except Exception as e:
-                print(f"  ⚠️ 利润表失败: {str(e)}")
-            
-            # 测试现金流量表
-            try:
-                df_cashflow = ak.stock_cash_flow_sheet_by_report_em(
-                    symbol=symbol
-                )
-                if df_cashflow is not None and not df_cashflow.empty:
-                    print(f"  ✅ 现金流量表成功: {len(df_cashflow)} 条")
-                    return {"success": True, "type": "cashflow", "count": len(df_cashflow)}
-                else:
-                    print(f"  ⚠️ 现金流量表为空")
-            except Exception as e:
-                print(f"  ⚠️ 现金流量表失败: {str(e)}")
-            
-            return {"success": False, "reason": "所有财务表均失败"}
+            with ThreadPoolExecutor(max_workers=len(FINANCIAL_STATEMENTS)) as executor:
+                futures = {
+                    executor.submit(cached_call, api, getattr(ak, api), TTL_HISTORY, symbol=symbol): key
+                    for key, _, api in FINANCIAL_STATEMENTS
+                }
+                outcomes = {}
+                for future in as_completed(futures):
+                    try:
+                        outcomes[futures[future]] = future.result()
+                    except Exception as e:
+                        outcomes[futures[future]] = e
+        
+        results = {}
+        for key, label, _ in FINANCIAL_STATEMENTS:
+            df = outcomes.get(key)
+            if isinstance(df, Exception):
+                print(f"  ⚠️ {label}失败: {str(df)}")
+                results[key] = {"success": False, "reason": str(df)}
+            elif df is not None and not df.empty:
+                print(f"  ✅ {label}成功: {len(df)} 条")
+                results[key] = {"success": True, "count": len(df)}
+            else:
+                print(f"  ⚠️ {label}为空")
+                results[key] = {"success": False, "reason": "返回空数据"}
+        
+        if any(r["success"] for r in results.values()):
+            return {"success": True, "results": results}
+        return {"success": False, "reason": "所有财务表均失败", "results": results}
     except Exception as e:
         error_msg = str(e)
         print(f"  ❌ 异常: {type(e).__name__} - {error_msg}")
         return {"success": False, "reason": error_msg}
 
 
-def test_unified_access(symbol: str):
+@lru_cache(maxsize=1)
+def _fetcher() -> UnifiedDataAccess:
+    """复用同一个 UnifiedDataAccess 实例，保留其内部缓存与连接"""
+    return UnifiedDataAccess()
+
+
+def test_unified_access(symbol: str, start_date: str = None, end_date: str = None):
     """测试统一数据访问接口"""
     print(f"\n[测试] UnifiedDataAccess - 综合测试 ({symbol})")
     try:
-        fetcher = UnifiedDataAccess()
+        fetcher = _fetcher()
         
         # 测试基本信息
         print(f"  [1] 测试基本信息...")
@@ -242,8 +360,8 @@ def test_unified_access(symbol: str):
         
         # 测试历史数据
         print(f"  [2] 测试历史数据...")
-        end_date = datetime.now().strftime('%Y%m%d')
-        start_date = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
+        if not (start_date and end_date):
+            start_date, end_date = _date_range(30)
         hist_data = fetcher.get_stock_hist_data(symbol, start_date=start_date, end_date=end_date)
         if hist_data is not None and not hist_data.empty:
             print(f"      ✅ 成功: {len(hist_data)} 条")
@@ -272,10 +390,68 @@ def test_unified_access(symbol: str):
         return {"success": False, "reason": str(e)}
 
 
+def _probe_akshare_batch(symbols):
+    """基于同一份实时行情快照检查所有股票；返回 [(symbol, 是否成功, 输出信息)]"""
+    try:
+        snap = _spot_snapshot()
+    except Exception as e:
+        return [(symbol, False, f"  ❌ AKShare实时行情: {str(e)}") for symbol in symbols]
+    if snap is None or snap.empty:
+        return [(symbol, False, f"  ❌ AKShare实时行情: 数据为空") for symbol in symbols]
+    # 一次 isin 取出所有目标股票，循环内只做索引查找
+    hits = snap[snap.index.isin(symbols)]
+    results = []
+    for symbol in symbols:
+        if symbol in hits.index:
+            name = hits.at[symbol, '名称'] if '名称' in hits.columns else 'N/A'
+            results.append((symbol, True, f"  ✅ AKShare实时行情: 找到 ({name})"))
+        else:
+            results.append((symbol, False, f"  ❌ AKShare实时行情: 未找到"))
+    return results
+
+
+def _probe_tushare_batch(symbols, start_date: str = None, end_date: str = None, ts_codes=None):
+    """一次请求取回所有股票的Tushare日线数据，再按 ts_code 拆分；返回 [(symbol, 是否成功, 输出信息)]"""
+    ts_codes = ts_codes or tuple(f"{symbol}.BJ" for symbol in symbols)
+    if not data_source_manager.tushare_available:
+        return [(symbol, False, f"  ⚠️ Tushare未初始化") for symbol in symbols]
+    try:
+        if not (start_date and end_date):
+            start_date, end_date = _date_range(5)
+        # daily 接口支持逗号分隔的多个 ts_code，5 次请求合并为 1 次
+        df_all = cached_call(
+            'daily',
+            data_source_manager.tushare_api.daily,
+            TTL_HISTORY,
+            ts_code=','.join(ts_codes),
+            start_date=start_date,
+            end_date=end_date
+        )
+    except Exception as e:
+        return [(symbol, False, f"  ❌ Tushare日线数据: {str(e)}") for symbol in symbols]
+    if df_all is None or df_all.empty:
+        return [(symbol, False, f"  ❌ Tushare日线数据: 返回空") for symbol in symbols]
+    counts = df_all['ts_code'].value_counts()
+    results = []
+    for symbol, ts_code in zip(symbols, ts_codes):
+        count = int(counts.get(ts_code, 0))
+        if count:
+            results.append((symbol, True, f"  ✅ Tushare日线数据: 成功 ({count} 条)"))
+        else:
+            results.append((symbol, False, f"  ❌ Tushare日线数据: 返回空"))
+    return results
+
+
 def main():
     """主函数"""
+    parse_cache_flag()
+    # 日期范围只计算一次，传给各测试函数
+    now = datetime.now()
+    start_30, end = _date_range(30, now)
+    start_5, _ = _date_range(5, now)
+    
     print_header("Tushare和AKShare对北交所股票数据支持情况测试")
-    print(f"\n测试时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n测试时间: {now.strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"测试股票: {', '.join(BSE_TEST_STOCKS)}")
     print(f"\n参考文档:")
     print(f"  - Tushare: https://tushare.pro/document/")
@@ -289,69 +465,38 @@ def main():
     }
     
     # 测试第一只股票作为示例
-    test_symbol = BSE_TEST_STOCKS[0]
+    test_symbol, test_ts_code = BSE_TEST_STOCKS[0], BSE_TS_CODES[0]
     
     print_header(f"详细测试: {test_symbol}")
     
     # Tushare测试
     print_header("Tushare接口测试")
-    summary["tushare"]["basic_info"].append(test_tushare_basic_info(test_symbol))
-    summary["tushare"]["daily_data"].append(test_tushare_daily_data(test_symbol))
+    summary["tushare"]["basic_info"].append(test_tushare_basic_info(test_symbol, test_ts_code))
+    summary["tushare"]["daily_data"].append(test_tushare_daily_data(test_symbol, start_30, end, ts_code=test_ts_code))
     
     # AKShare测试
     print_header("AKShare接口测试")
-    summary["akshare"]["spot_data"].append(test_akshare_spot_data(test_symbol))
+    summary["akshare"]["spot_data"].append(test_akshare_spot_data(test_symbol, start_30, end))
     summary["akshare"]["financial_data"].append(test_akshare_financial_data(test_symbol))
     
     # 统一接口测试
     print_header("统一数据访问接口测试")
-    summary["unified"].append(test_unified_access(test_symbol))
+    summary["unified"].append(test_unified_access(test_symbol, start_30, end))
     
     # 批量测试所有股票（简化版）
     print_header("批量测试所有股票")
-    akshare_success_count = 0
-    tushare_success_count = 0
+    # 两个数据源各只发起一次请求（实时行情快照 / 多代码日线），之后按股票顺序打印
+    from network_optimizer import network_optimizer
+    with network_optimizer.apply():
+        akshare_results = _probe_akshare_batch(BSE_TEST_STOCKS)
+    tushare_results = _probe_tushare_batch(BSE_TEST_STOCKS, start_5, end, ts_codes=BSE_TS_CODES)
     
-    for symbol in BSE_TEST_STOCKS:
+    for (symbol, _, ak_msg), (_, _, ts_msg) in zip(akshare_results, tushare_results):
         print(f"\n股票: {symbol}")
-        
-        # 快速测试AKShare实时行情
-        try:
-            from network_optimizer import network_optimizer
-            with network_optimizer.apply():
-                df_all = ak.stock_zh_a_spot_em()
-                if df_all is not None and not df_all.empty:
-                    df_stock = df_all[df_all['代码'] == symbol]
-                    if not df_stock.empty:
-                        print(f"  ✅ AKShare实时行情: 找到 ({df_stock.iloc[0].get('名称', 'N/A')})")
-                        akshare_success_count += 1
-                    else:
-                        print(f"  ❌ AKShare实时行情: 未找到")
-                else:
-                    print(f"  ❌ AKShare实时行情: 数据为空")
-        except Exception as e:
-            print(f"  ❌ AKShare实时行情: {str(e)}")
-        
-        # 快速测试Tushare日线数据
-        try:
-            if data_source_manager.tushare_available:
-                ts_code = f"{symbol}.BJ"
-                end_date = datetime.now().strftime('%Y%m%d')
-                start_date = (datetime.now() - timedelta(days=5)).strftime('%Y%m%d')
-                df = data_source_manager.tushare_api.daily(
-                    ts_code=ts_code,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                if df is not None and not df.empty:
-                    print(f"  ✅ Tushare日线数据: 成功 ({len(df)} 条)")
-                    tushare_success_count += 1
-                else:
-                    print(f"  ❌ Tushare日线数据: 返回空")
-            else:
-                print(f"  ⚠️ Tushare未初始化")
-        except Exception as e:
-            print(f"  ❌ Tushare日线数据: {str(e)}")
+        print(ak_msg)
+        print(ts_msg)
+    akshare_success_count = sum(1 for _, ok, _ in akshare_results if ok)
+    tushare_success_count = sum(1 for _, ok, _ in tushare_results if ok)
     
     # 打印汇总
     print_header("测试结果汇总")
@@ -359,6 +504,9 @@ def main():
     print(f"  基本信息接口: {sum(1 for r in summary['tushare']['basic_info'] if r.get('success'))}/{len(summary['tushare']['basic_info'])} 成功")
     print(f"  日线数据接口: {sum(1 for r in summary['tushare']['daily_data'] if r.get('success'))}/{len(summary['tushare']['daily_data'])} 成功")
     print(f"  批量测试: {tushare_success_count}/{len(BSE_TEST_STOCKS)} 成功")
+    for r in summary['tushare']['basic_info'] + summary['tushare']['daily_data']:
+        if 'elapsed' in r:
+            print(f"  耗时 {r['label']}: {r['elapsed']:.2f}s")
     
     print(f"\nAKShare支持情况:")
     print(f"  实时行情接口: {sum(1 for r in summary['akshare']['spot_data'] if r.get('success'))}/{len(summary['akshare']['spot_data'])} 成功")
@@ -381,5 +529,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with _shared_session():
+        main()
 
@@ -6,17 +6,27 @@
 """
 
 import sys
-import io
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-# 设置UTF-8编码输出（Windows兼容）
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+# 设置UTF-8编码输出（Windows兼容）：原地重配置，不替换 stdout 对象；也可设置 PYTHONUTF8=1
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    for _stream in (sys.stdout, sys.stderr):
+        if hasattr(_stream, 'reconfigure'):
+            _stream.reconfigure(encoding='utf-8')
 
 from unified_data_access import UnifiedDataAccess
 from debug_logger import debug_logger
+from tushare_test_cache import cached_fetch, format_hit, parse_cache_flag
 
 # 北交所测试股票列表（8开头或4开头）
 BSE_TEST_STOCKS = [
@@ -27,361 +37,513 @@ BSE_TEST_STOCKS = [
     "430047",  # 诺思兰德（示例，4开头）
 ]
 
+# 只读接口的磁盘缓存（tushare_test_cache）：按数据更新频率设置有效期（秒），--no-cache 可跳过
+CACHE_TTL = {
+    "hist_data": 24 * 3600,
+    "financial_data": 24 * 3600,
+    "research_reports": 7 * 24 * 3600,
+    "announcement_data": 24 * 3600,
+    "chip_distribution": 24 * 3600,
+}
+
+# 每次运行的逐项结果追加到此文件，便于跨次回归对比
+HISTORY_PATH = Path(__file__).resolve().parent / ".cache" / "bse_tests" / "history.csv"
+SUMMARY_COLUMNS = ("symbol", "test", "success", "elapsed", "note", "error")
+
+
+# 结果来自本地缓存时写入 note，汇总与 history.csv 据此区分缓存结果与实际请求
+CACHED_NOTE = "缓存"
+
+
+def _cached(endpoint: str, fn, symbol: str, buf: List[str], **kwargs):
+    """按 (接口, 代码, 参数) 缓存 fetcher 返回值，返回 (结果, 是否来自缓存)；空结果不缓存，避免把失败固化
+
+    命中缓存时在测试输出中注明，避免把旧数据的成功误当作接口可用。
+    """
+    result, ts = cached_fetch(endpoint, fn, CACHE_TTL[endpoint], symbol=symbol, **kwargs)
+    if ts is not None:
+        buf.append(f"   💾 {format_hit(endpoint, ts)}")
+    return result, ts is not None
+
+
+# 输出分隔线与汇总中的测试项名称
+SEP60, SEP80, HASH80, DASH80 = "=" * 60, "=" * 80, "#" * 80, "-" * 80
+TEST_NAMES = {
+    "basic_info": "基本信息",
+    "stock_info": "完整信息",
+    "hist_data": "历史K线",
+    "financial_data": "财务数据",
+    "research_reports": "研报数据",
+    "announcement_data": "公告数据",
+    "chip_distribution": "筹码分布",
+}
+
+# 并发配置：线程池大小与同时在途的接口调用上限（避免触发Tushare限流）
+MAX_WORKERS = 16
+CONCURRENCY_LIMIT = 8
+
+_API_SEMAPHORE = threading.BoundedSemaphore(CONCURRENCY_LIMIT)
+_PRINT_LOCK = threading.Lock()
+_STOCK_INFO_LOCKS: Dict[str, threading.Lock] = {}
+
+
+def _build_session() -> requests.Session:
+    """测试共用的连接池会话：各股票、各接口的 HTTP 请求复用 keep-alive 连接"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=3)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
-def test_stock_basic_info(symbol: str, fetcher: UnifiedDataAccess) -> Dict[str, Any]:
+@lru_cache(maxsize=128)
+def _fetch_stock_info(fetcher: UnifiedDataAccess, symbol: str):
+    return fetcher.get_stock_info(symbol)
+
+
+def _cached_stock_info(fetcher: UnifiedDataAccess, symbol: str):
+    """同一轮测试内按股票复用 get_stock_info 结果（完整信息与筹码分布测试共用）
+
+    按代码加锁，保证并发执行时同一只股票只请求一次。
+    """
+    with _STOCK_INFO_LOCKS.setdefault(symbol, threading.Lock()):
+        return _fetch_stock_info(fetcher, symbol)
+
+
+def _write_lines(lines: List[str]) -> None:
+    """加锁后一次性写出整块输出，并发执行时各块之间不会交错"""
+    with _PRINT_LOCK:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+
+def test_stock_basic_info(symbol: str, fetcher: UnifiedDataAccess, buf: List[str]) -> Dict[str, Any]:
     """测试获取股票基本信息"""
-    print(f"\n{'='*60}")
-    print(f"📊 测试1: 获取基本信息 - {symbol}")
-    print(f"{'='*60}")
+    buf.append(f"\n{SEP60}")
+    buf.append(f"📊 测试1: 获取基本信息 - {symbol}")
+    buf.append(SEP60)
     
     try:
-        start_time = datetime.now()
+        t0 = time.perf_counter()
         info = fetcher.get_stock_basic_info(symbol)
-        elapsed = (datetime.now() - start_time).total_seconds()
+        elapsed = time.perf_counter() - t0
         
         if info:
-            print(f"✅ 成功获取基本信息 (耗时: {elapsed:.2f}秒)")
-            print(f"   代码: {info.get('symbol', 'N/A')}")
-            print(f"   名称: {info.get('name', 'N/A')}")
-            print(f"   行业: {info.get('industry', 'N/A')}")
-            print(f"   市场: {info.get('market', 'N/A')}")
+            buf.append(f"✅ 成功获取基本信息 (耗时: {elapsed:.2f}秒)")
+            buf.append(f"   代码: {info.get('symbol', 'N/A')}")
+            buf.append(f"   名称: {info.get('name', 'N/A')}")
+            buf.append(f"   行业: {info.get('industry', 'N/A')}")
+            buf.append(f"   市场: {info.get('market', 'N/A')}")
             return {"success": True, "data": info, "elapsed": elapsed}
         else:
-            print(f"❌ 获取基本信息失败: 返回None或空")
+            buf.append(f"❌ 获取基本信息失败: 返回None或空")
             return {"success": False, "error": "返回None或空", "elapsed": elapsed}
     except Exception as e:
         error_type = type(e).__name__
         error_msg = str(e)
-        print(f"❌ 获取基本信息异常: {error_type} - {error_msg}")
+        buf.append(f"❌ 获取基本信息异常: {error_type} - {error_msg}")
         debug_logger.error("测试基本信息失败", symbol=symbol, error_type=error_type, error_message=error_msg)
         return {"success": False, "error": f"{error_type}: {error_msg}", "elapsed": 0}
 
 
-def test_stock_info(symbol: str, fetcher: UnifiedDataAccess) -> Dict[str, Any]:
+def test_stock_info(symbol: str, fetcher: UnifiedDataAccess, buf: List[str]) -> Dict[str, Any]:
     """测试获取股票完整信息（包含实时行情、估值等）"""
-    print(f"\n{'='*60}")
-    print(f"📊 测试2: 获取完整信息 - {symbol}")
-    print(f"{'='*60}")
+    buf.append(f"\n{SEP60}")
+    buf.append(f"📊 测试2: 获取完整信息 - {symbol}")
+    buf.append(SEP60)
     
     try:
-        start_time = datetime.now()
-        info = fetcher.get_stock_info(symbol)
-        elapsed = (datetime.now() - start_time).total_seconds()
+        t0 = time.perf_counter()
+        info = _cached_stock_info(fetcher, symbol)
+        elapsed = time.perf_counter() - t0
         
         if info:
-            print(f"✅ 成功获取完整信息 (耗时: {elapsed:.2f}秒)")
-            print(f"   代码: {info.get('symbol', 'N/A')}")
-            print(f"   名称: {info.get('name', 'N/A')}")
-            print(f"   当前价格: {info.get('current_price', 'N/A')}")
-            print(f"   涨跌幅: {info.get('change_percent', 'N/A')}")
-            print(f"   市盈率: {info.get('pe_ratio', 'N/A')}")
-            print(f"   市净率: {info.get('pb_ratio', 'N/A')}")
-            print(f"   市值: {info.get('market_cap', 'N/A')}")
-            print(f"   Beta系数: {info.get('beta', 'N/A')}")
-            print(f"   52周最高: {info.get('52_week_high', 'N/A')}")
-            print(f"   52周最低: {info.get('52_week_low', 'N/A')}")
+            buf.append(f"✅ 成功获取完整信息 (耗时: {elapsed:.2f}秒)")
+            buf.append(f"   代码: {info.get('symbol', 'N/A')}")
+            buf.append(f"   名称: {info.get('name', 'N/A')}")
+            buf.append(f"   当前价格: {info.get('current_price', 'N/A')}")
+            buf.append(f"   涨跌幅: {info.get('change_percent', 'N/A')}")
+            buf.append(f"   市盈率: {info.get('pe_ratio', 'N/A')}")
+            buf.append(f"   市净率: {info.get('pb_ratio', 'N/A')}")
+            buf.append(f"   市值: {info.get('market_cap', 'N/A')}")
+            buf.append(f"   Beta系数: {info.get('beta', 'N/A')}")
+            buf.append(f"   52周最高: {info.get('52_week_high', 'N/A')}")
+            buf.append(f"   52周最低: {info.get('52_week_low', 'N/A')}")
             return {"success": True, "data": info, "elapsed": elapsed}
         else:
-            print(f"❌ 获取完整信息失败: 返回None或空")
+            buf.append(f"❌ 获取完整信息失败: 返回None或空")
             return {"success": False, "error": "返回None或空", "elapsed": elapsed}
     except Exception as e:
         error_type = type(e).__name__
         error_msg = str(e)
-        print(f"❌ 获取完整信息异常: {error_type} - {error_msg}")
+        buf.append(f"❌ 获取完整信息异常: {error_type} - {error_msg}")
         debug_logger.error("测试完整信息失败", symbol=symbol, error_type=error_type, error_message=error_msg)
         return {"success": False, "error": f"{error_type}: {error_msg}", "elapsed": 0}
 
 
-def test_stock_hist_data(symbol: str, fetcher: UnifiedDataAccess) -> Dict[str, Any]:
-    """测试获取历史K线数据"""
-    print(f"\n{'='*60}")
-    print(f"📊 测试3: 获取历史K线数据 - {symbol}")
-    print(f"{'='*60}")
+def _recent_range(days: int = 30):
+    """返回最近 days 天的 (start_date, end_date)，格式 YYYYMMDD"""
+    now = datetime.now()
+    return (now - timedelta(days=days)).strftime('%Y%m%d'), now.strftime('%Y%m%d')
+
+
+def test_stock_hist_data(symbol: str, fetcher: UnifiedDataAccess, buf: List[str],
+                         start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+    """测试获取历史K线数据（未传日期时取最近30天）"""
+    buf.append(f"\n{SEP60}")
+    buf.append(f"📊 测试3: 获取历史K线数据 - {symbol}")
+    buf.append(SEP60)
     
     try:
-        # 获取最近30天的数据
-        end_date = datetime.now().strftime('%Y%m%d')
-        start_date = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
+        if start_date is None or end_date is None:
+            start_date, end_date = _recent_range()
         
-        start_time = datetime.now()
-        df = fetcher.get_stock_hist_data(symbol, start_date=start_date, end_date=end_date)
-        elapsed = (datetime.now() - start_time).total_seconds()
+        t0 = time.perf_counter()
+        df, from_cache = _cached("hist_data", fetcher.get_stock_hist_data, symbol, buf, start_date=start_date, end_date=end_date)
+        elapsed = time.perf_counter() - t0
         
         if df is not None and not df.empty:
-            print(f"✅ 成功获取历史K线数据 (耗时: {elapsed:.2f}秒)")
-            print(f"   数据条数: {len(df)}")
-            print(f"   日期范围: {df.index[0] if hasattr(df.index[0], 'strftime') else str(df.index[0])} 至 {df.index[-1] if hasattr(df.index[-1], 'strftime') else str(df.index[-1])}")
-            if 'close' in df.columns or '收盘' in df.columns:
-                close_col = 'close' if 'close' in df.columns else '收盘'
-                latest_close = df[close_col].iloc[-1]
-                print(f"   最新收盘价: {latest_close}")
-            return {"success": True, "data_count": len(df), "elapsed": elapsed}
+            buf.append(f"✅ 成功获取历史K线数据 (耗时: {elapsed:.2f}秒)")
+            buf.append(f"   数据条数: {len(df)}")
+            # 首尾索引各取一次（f-string 对日期/字符串输出一致，无需区分类型）
+            index = df.index
+            buf.append(f"   日期范围: {index[0]} 至 {index[-1]}")
+            cols = set(df.columns)
+            close_col = 'close' if 'close' in cols else ('收盘' if '收盘' in cols else None)
+            if close_col is not None:
+                latest_close = df[close_col].iat[-1]
+                buf.append(f"   最新收盘价: {latest_close}")
+            return {"success": True, "data_count": len(df), "elapsed": elapsed,
+                    "note": CACHED_NOTE if from_cache else ""}
         else:
-            print(f"❌ 获取历史K线数据失败: 返回None或空DataFrame")
+            buf.append(f"❌ 获取历史K线数据失败: 返回None或空DataFrame")
             return {"success": False, "error": "返回None或空DataFrame", "elapsed": elapsed}
     except Exception as e:
         error_type = type(e).__name__
         error_msg = str(e)
-        print(f"❌ 获取历史K线数据异常: {error_type} - {error_msg}")
+        buf.append(f"❌ 获取历史K线数据异常: {error_type} - {error_msg}")
         debug_logger.error("测试历史K线数据失败", symbol=symbol, error_type=error_type, error_message=error_msg)
         return {"success": False, "error": f"{error_type}: {error_msg}", "elapsed": 0}
 
 
-def test_financial_data(symbol: str, fetcher: UnifiedDataAccess) -> Dict[str, Any]:
+def test_financial_data(symbol: str, fetcher: UnifiedDataAccess, buf: List[str]) -> Dict[str, Any]:
     """测试获取财务数据"""
-    print(f"\n{'='*60}")
-    print(f"📊 测试4: 获取财务数据 - {symbol}")
-    print(f"{'='*60}")
+    buf.append(f"\n{SEP60}")
+    buf.append(f"📊 测试4: 获取财务数据 - {symbol}")
+    buf.append(SEP60)
     
     try:
-        start_time = datetime.now()
-        financial_data = fetcher.get_financial_data(symbol)
-        elapsed = (datetime.now() - start_time).total_seconds()
+        t0 = time.perf_counter()
+        financial_data, from_cache = _cached("financial_data", fetcher.get_financial_data, symbol, buf)
+        elapsed = time.perf_counter() - t0
         
         if financial_data and isinstance(financial_data, dict):
-            print(f"✅ 成功获取财务数据 (耗时: {elapsed:.2f}秒)")
+            buf.append(f"✅ 成功获取财务数据 (耗时: {elapsed:.2f}秒)")
             # 显示部分财务数据
             if 'income_statement' in financial_data and financial_data['income_statement']:
                 income_info = financial_data['income_statement']
                 if isinstance(income_info, dict) and 'periods' in income_info:
-                    print(f"   利润表数据: {income_info.get('periods', 0)} 条")
+                    buf.append(f"   利润表数据: {income_info.get('periods', 0)} 条")
             if 'balance_sheet' in financial_data and financial_data['balance_sheet']:
                 balance_info = financial_data['balance_sheet']
                 if isinstance(balance_info, dict) and 'periods' in balance_info:
-                    print(f"   资产负债表数据: {balance_info.get('periods', 0)} 条")
+                    buf.append(f"   资产负债表数据: {balance_info.get('periods', 0)} 条")
             if 'cash_flow' in financial_data and financial_data['cash_flow']:
                 cashflow_info = financial_data['cash_flow']
                 if isinstance(cashflow_info, dict) and 'periods' in cashflow_info:
-                    print(f"   现金流量表数据: {cashflow_info.get('periods', 0)} 条")
-            return {"success": True, "elapsed": elapsed}
+                    buf.append(f"   现金流量表数据: {cashflow_info.get('periods', 0)} 条")
+            return {"success": True, "elapsed": elapsed, "note": CACHED_NOTE if from_cache else ""}
         else:
-            print(f"❌ 获取财务数据失败: 返回None或非字典类型")
+            buf.append(f"❌ 获取财务数据失败: 返回None或非字典类型")
             return {"success": False, "error": "返回None或非字典类型", "elapsed": elapsed}
     except Exception as e:
         error_type = type(e).__name__
         error_msg = str(e)
-        print(f"❌ 获取财务数据异常: {error_type} - {error_msg}")
+        buf.append(f"❌ 获取财务数据异常: {error_type} - {error_msg}")
         debug_logger.error("测试财务数据失败", symbol=symbol, error_type=error_type, error_message=error_msg)
         return {"success": False, "error": f"{error_type}: {error_msg}", "elapsed": 0}
 
 
-def test_research_reports(symbol: str, fetcher: UnifiedDataAccess) -> Dict[str, Any]:
+def test_research_reports(symbol: str, fetcher: UnifiedDataAccess, buf: List[str]) -> Dict[str, Any]:
     """测试获取研报数据"""
-    print(f"\n{'='*60}")
-    print(f"📊 测试5: 获取研报数据 - {symbol}")
-    print(f"{'='*60}")
+    buf.append(f"\n{SEP60}")
+    buf.append(f"📊 测试5: 获取研报数据 - {symbol}")
+    buf.append(SEP60)
     
     try:
-        start_time = datetime.now()
-        research_data = fetcher.get_research_reports_data(symbol, days=180)
-        elapsed = (datetime.now() - start_time).total_seconds()
+        t0 = time.perf_counter()
+        research_data, from_cache = _cached("research_reports", fetcher.get_research_reports_data, symbol, buf, days=180)
+        elapsed = time.perf_counter() - t0
         
         if research_data and isinstance(research_data, dict):
             count = research_data.get('count', 0)
             if count > 0:
-                print(f"✅ 成功获取研报数据 (耗时: {elapsed:.2f}秒)")
-                print(f"   研报数量: {count}")
+                buf.append(f"✅ 成功获取研报数据 (耗时: {elapsed:.2f}秒)")
+                buf.append(f"   研报数量: {count}")
                 reports = research_data.get('reports', [])
                 if reports:
-                    print(f"   最新研报: {reports[0].get('title', 'N/A')[:50]}...")
-                return {"success": True, "count": count, "elapsed": elapsed}
+                    buf.append(f"   最新研报: {reports[0].get('title', 'N/A')[:50]}...")
+                return {"success": True, "count": count, "elapsed": elapsed,
+                        "note": CACHED_NOTE if from_cache else ""}
             else:
-                print(f"⚠️ 研报数据为空 (耗时: {elapsed:.2f}秒)")
+                buf.append(f"⚠️ 研报数据为空 (耗时: {elapsed:.2f}秒)")
                 return {"success": True, "count": 0, "elapsed": elapsed, "note": "数据为空"}
         else:
-            print(f"❌ 获取研报数据失败: 返回None或非字典类型")
+            buf.append(f"❌ 获取研报数据失败: 返回None或非字典类型")
             return {"success": False, "error": "返回None或非字典类型", "elapsed": elapsed}
     except Exception as e:
         error_type = type(e).__name__
         error_msg = str(e)
-        print(f"❌ 获取研报数据异常: {error_type} - {error_msg}")
+        buf.append(f"❌ 获取研报数据异常: {error_type} - {error_msg}")
         debug_logger.error("测试研报数据失败", symbol=symbol, error_type=error_type, error_message=error_msg)
         return {"success": False, "error": f"{error_type}: {error_msg}", "elapsed": 0}
 
 
-def test_announcement_data(symbol: str, fetcher: UnifiedDataAccess) -> Dict[str, Any]:
+def test_announcement_data(symbol: str, fetcher: UnifiedDataAccess, buf: List[str]) -> Dict[str, Any]:
     """测试获取公告数据"""
-    print(f"\n{'='*60}")
-    print(f"📊 测试6: 获取公告数据 - {symbol}")
-    print(f"{'='*60}")
+    buf.append(f"\n{SEP60}")
+    buf.append(f"📊 测试6: 获取公告数据 - {symbol}")
+    buf.append(SEP60)
     
     try:
-        start_time = datetime.now()
-        announcement_data = fetcher.get_announcement_data(symbol, days=30)
-        elapsed = (datetime.now() - start_time).total_seconds()
+        t0 = time.perf_counter()
+        announcement_data, from_cache = _cached("announcement_data", fetcher.get_announcement_data, symbol, buf, days=30)
+        elapsed = time.perf_counter() - t0
         
         if announcement_data and isinstance(announcement_data, dict):
             count = len(announcement_data.get('announcements', []))
             if count > 0:
-                print(f"✅ 成功获取公告数据 (耗时: {elapsed:.2f}秒)")
-                print(f"   公告数量: {count}")
+                buf.append(f"✅ 成功获取公告数据 (耗时: {elapsed:.2f}秒)")
+                buf.append(f"   公告数量: {count}")
                 announcements = announcement_data.get('announcements', [])
                 if announcements:
-                    print(f"   最新公告: {announcements[0].get('title', 'N/A')[:50]}...")
-                return {"success": True, "count": count, "elapsed": elapsed}
+                    buf.append(f"   最新公告: {announcements[0].get('title', 'N/A')[:50]}...")
+                return {"success": True, "count": count, "elapsed": elapsed,
+                        "note": CACHED_NOTE if from_cache else ""}
             else:
-                print(f"⚠️ 公告数据为空 (耗时: {elapsed:.2f}秒)")
+                buf.append(f"⚠️ 公告数据为空 (耗时: {elapsed:.2f}秒)")
                 return {"success": True, "count": 0, "elapsed": elapsed, "note": "数据为空"}
         else:
-            print(f"❌ 获取公告数据失败: 返回None或非字典类型")
+            buf.append(f"❌ 获取公告数据失败: 返回None或非字典类型")
             return {"success": False, "error": "返回None或非字典类型", "elapsed": elapsed}
     except Exception as e:
         error_type = type(e).__name__
         error_msg = str(e)
-        print(f"❌ 获取公告数据异常: {error_type} - {error_msg}")
+        buf.append(f"❌ 获取公告数据异常: {error_type} - {error_msg}")
         debug_logger.error("测试公告数据失败", symbol=symbol, error_type=error_type, error_message=error_msg)
         return {"success": False, "error": f"{error_type}: {error_msg}", "elapsed": 0}
 
 
-def test_chip_distribution(symbol: str, fetcher: UnifiedDataAccess) -> Dict[str, Any]:
+def test_chip_distribution(symbol: str, fetcher: UnifiedDataAccess, buf: List[str]) -> Dict[str, Any]:
     """测试获取筹码分布数据"""
-    print(f"\n{'='*60}")
-    print(f"📊 测试7: 获取筹码分布数据 - {symbol}")
-    print(f"{'='*60}")
+    buf.append(f"\n{SEP60}")
+    buf.append(f"📊 测试7: 获取筹码分布数据 - {symbol}")
+    buf.append(SEP60)
     
     try:
         # 先获取当前价格
-        stock_info = fetcher.get_stock_info(symbol)
+        stock_info = _cached_stock_info(fetcher, symbol)
         current_price = stock_info.get('current_price') if stock_info else None
         if isinstance(current_price, str) and current_price == 'N/A':
             current_price = None
         
-        start_time = datetime.now()
-        chip_data = fetcher.get_chip_distribution_data(symbol, current_price=current_price)
-        elapsed = (datetime.now() - start_time).total_seconds()
+        t0 = time.perf_counter()
+        # 缓存键只含股票代码：current_price 来自实时行情，每次运行都不同，放进键里永远不会命中
+        chip_data, from_cache = _cached(
+            "chip_distribution", partial(fetcher.get_chip_distribution_data, current_price=current_price), symbol, buf
+        )
+        elapsed = time.perf_counter() - t0
         
         if chip_data and isinstance(chip_data, dict):
-            print(f"✅ 成功获取筹码分布数据 (耗时: {elapsed:.2f}秒)")
+            buf.append(f"✅ 成功获取筹码分布数据 (耗时: {elapsed:.2f}秒)")
             summary = chip_data.get('summary', {})
             if summary:
-                print(f"   筹码集中度: {summary.get('concentration', 'N/A')}")
-                print(f"   平均成本: {summary.get('avg_cost', 'N/A')}")
-                print(f"   成本区间: {summary.get('cost_range', 'N/A')}")
-            return {"success": True, "elapsed": elapsed}
+                buf.append(f"   筹码集中度: {summary.get('concentration', 'N/A')}")
+                buf.append(f"   平均成本: {summary.get('avg_cost', 'N/A')}")
+                buf.append(f"   成本区间: {summary.get('cost_range', 'N/A')}")
+            return {"success": True, "elapsed": elapsed, "note": CACHED_NOTE if from_cache else ""}
         else:
-            print(f"❌ 获取筹码分布数据失败: 返回None或非字典类型")
+            buf.append(f"❌ 获取筹码分布数据失败: 返回None或非字典类型")
             return {"success": False, "error": "返回None或非字典类型", "elapsed": elapsed}
     except Exception as e:
         error_type = type(e).__name__
         error_msg = str(e)
-        print(f"❌ 获取筹码分布数据异常: {error_type} - {error_msg}")
+        buf.append(f"❌ 获取筹码分布数据异常: {error_type} - {error_msg}")
         debug_logger.error("测试筹码分布数据失败", symbol=symbol, error_type=error_type, error_message=error_msg)
         return {"success": False, "error": f"{error_type}: {error_msg}", "elapsed": 0}
 
 
-def run_single_stock_test(symbol: str, fetcher: UnifiedDataAccess) -> Dict[str, Any]:
-    """对单只股票运行所有测试"""
-    print(f"\n{'#'*80}")
-    print(f"# 测试股票: {symbol}")
-    print(f"{'#'*80}")
-    
-    results = {
-        "symbol": symbol,
-        "tests": {}
-    }
-    
-    # 测试1: 基本信息
-    results["tests"]["basic_info"] = test_stock_basic_info(symbol, fetcher)
-    
-    # 测试2: 完整信息
-    results["tests"]["stock_info"] = test_stock_info(symbol, fetcher)
-    
-    # 测试3: 历史K线数据
-    results["tests"]["hist_data"] = test_stock_hist_data(symbol, fetcher)
-    
-    # 测试4: 财务数据
-    results["tests"]["financial_data"] = test_financial_data(symbol, fetcher)
-    
-    # 测试5: 研报数据
-    results["tests"]["research_reports"] = test_research_reports(symbol, fetcher)
-    
-    # 测试6: 公告数据
-    results["tests"]["announcement_data"] = test_announcement_data(symbol, fetcher)
-    
-    # 测试7: 筹码分布数据
-    results["tests"]["chip_distribution"] = test_chip_distribution(symbol, fetcher)
-    
-    return results
+# 测试项顺序即输出与汇总顺序
+STOCK_TESTS = (
+    ("basic_info", test_stock_basic_info),          # 测试1: 基本信息
+    ("stock_info", test_stock_info),                # 测试2: 完整信息
+    ("hist_data", test_stock_hist_data),            # 测试3: 历史K线数据
+    ("financial_data", test_financial_data),        # 测试4: 财务数据
+    ("research_reports", test_research_reports),    # 测试5: 研报数据
+    ("announcement_data", test_announcement_data),  # 测试6: 公告数据
+    ("chip_distribution", test_chip_distribution),  # 测试7: 筹码分布数据
+)
+
+
+def _run_test(test_fn, symbol: str, fetcher: UnifiedDataAccess):
+    """在信号量限制下执行单个测试项，返回 (结果, 该测试项的输出行)"""
+    buf: List[str] = []
+    with _API_SEMAPHORE:
+        result = test_fn(symbol, fetcher, buf)
+    return result, buf
+
+
+def _stock_header(symbol: str) -> List[str]:
+    return [f"\n{HASH80}", f"# 测试股票: {symbol}", HASH80]
+
+
+def _bind_dates(start_date: str, end_date: str):
+    """返回日期已绑定的测试项列表（日期在一次运行内只计算一次）"""
+    return tuple(
+        (key, partial(test_fn, start_date=start_date, end_date=end_date) if key == "hist_data" else test_fn)
+        for key, test_fn in STOCK_TESTS
+    )
+
+
+def run_single_stock_test(symbol: str, fetcher: UnifiedDataAccess,
+                          executor: ThreadPoolExecutor,
+                          start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+    """对单只股票运行所有测试：各测试项提交到executor并发执行，
+    全部完成后按测试项顺序连同股票标题整块输出"""
+    if start_date is None or end_date is None:
+        start_date, end_date = _recent_range()
+    stock_tests = _bind_dates(start_date, end_date)
+
+    futures = {key: executor.submit(_run_test, test_fn, symbol, fetcher)
+               for key, test_fn in stock_tests}
+    tests, lines = {}, _stock_header(symbol)
+    for key, future in futures.items():
+        tests[key], test_lines = future.result()
+        lines.extend(test_lines)
+
+    _write_lines(lines)
+    return {"symbol": symbol, "tests": tests}
 
 
 def print_summary(all_results: list):
     """打印测试结果汇总"""
-    print(f"\n\n{'='*80}")
-    print(f"📊 测试结果汇总")
-    print(f"{'='*80}")
-    
-    # 统计总体成功率
-    total_tests = 0
-    successful_tests = 0
+    buf: List[str] = []
+    _print_summary(all_results, buf)
+    _write_lines(buf)
+
+
+def _results_frame(all_results: list) -> pd.DataFrame:
+    """将 {symbol, tests} 结果展平为 (股票, 测试项) 一行的 DataFrame，缺失字段容错"""
+    rows = [
+        {
+            "symbol": r["symbol"],
+            "test": key,
+            "success": bool(res.get("success")),
+            "elapsed": float(res.get("elapsed") or 0.0),
+            "note": res.get("note") or "",
+            "error": res.get("error") or "",
+        }
+        for r in all_results
+        for key, res in r["tests"].items()
+    ]
+    df = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    return df
+
+
+def _append_history(df: pd.DataFrame, buf: List[str]) -> None:
+    try:
+        HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+        df.assign(run_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')).to_csv(
+            HISTORY_PATH, mode="a", index=False, header=not HISTORY_PATH.exists(), encoding="utf-8"
+        )
+    except OSError as e:
+        buf.append(f"⚠️ 写入测试历史失败: {e}")
+
+
+def _print_summary(all_results: list, buf: List[str]):
+    buf.append(f"\n\n{SEP80}")
+    buf.append(f"📊 测试结果汇总")
+    buf.append(SEP80)
     
-    test_names = {
-        "basic_info": "基本信息",
-        "stock_info": "完整信息",
-        "hist_data": "历史K线",
-        "financial_data": "财务数据",
-        "research_reports": "研报数据",
-        "announcement_data": "公告数据",
-        "chip_distribution": "筹码分布"
-    }
+    df = _results_frame(all_results)
     
-    for result in all_results:
-        symbol = result["symbol"]
-        print(f"\n股票代码: {symbol}")
-        print("-" * 80)
+    for symbol, group in df.groupby("symbol", sort=False):
+        buf.append(f"\n股票代码: {symbol}")
+        buf.append(DASH80)
         
-        for test_key, test_result in result["tests"].items():
-            total_tests += 1
-            test_name = test_names.get(test_key, test_key)
-            if test_result.get("success"):
-                successful_tests += 1
-                elapsed = test_result.get("elapsed", 0)
+        for row in group.itertuples(index=False):
+            test_name = TEST_NAMES.get(row.test, row.test)
+            if row.success:
                 status = "✅ 成功"
-                if test_result.get("note"):
-                    status += f" ({test_result.get('note')})"
-                print(f"  {test_name:15s}: {status:20s} (耗时: {elapsed:.2f}秒)")
+                if row.note:
+                    status += f" ({row.note})"
+                buf.append(f"  {test_name:15s}: {status:20s} (耗时: {row.elapsed:.2f}秒)")
             else:
-                error = test_result.get("error", "未知错误")
-                print(f"  {test_name:15s}: ❌ 失败 - {error[:50]}")
+                error = row.error or "未知错误"
+                buf.append(f"  {test_name:15s}: ❌ 失败 - {error[:50]}")
+    
+    # 按测试项统计成功率与平均耗时
+    if not df.empty:
+        by_test = df.groupby("test", sort=False).agg(
+            成功=("success", "sum"), 总数=("success", "size"), 平均耗时=("elapsed", "mean")
+        )
+        by_test["成功率"] = (by_test["成功"] / by_test["总数"] * 100).map("{:.1f}%".format)
+        by_test.index = by_test.index.map(lambda k: TEST_NAMES.get(k, k)).rename("测试项")
+        buf.append(f"\n按测试项统计:")
+        buf.append(by_test.round({"平均耗时": 2}).to_string())
+        _append_history(df, buf)
     
-    print(f"\n{'='*80}")
-    print(f"总体统计:")
-    print(f"  测试股票数: {len(all_results)}")
-    print(f"  测试项总数: {total_tests}")
-    print(f"  成功项数: {successful_tests}")
-    print(f"  失败项数: {total_tests - successful_tests}")
+    total_tests = len(df)
+    successful_tests = int(df["success"].sum())
+    buf.append(f"\n{SEP80}")
+    buf.append(f"总体统计:")
+    buf.append(f"  测试股票数: {len(all_results)}")
+    buf.append(f"  测试项总数: {total_tests}")
+    buf.append(f"  成功项数: {successful_tests}")
+    buf.append(f"  失败项数: {total_tests - successful_tests}")
     if total_tests > 0:
         success_rate = (successful_tests / total_tests) * 100
-        print(f"  成功率: {success_rate:.1f}%")
-    print(f"{'='*80}")
+        buf.append(f"  成功率: {success_rate:.1f}%")
+    buf.append(SEP80)
 
 
 def main():
     """主函数"""
-    print(f"\n{'='*80}")
+    parse_cache_flag()
+
+    # 输出按块写出：每只股票/汇总的输出先收集为行列表，再加锁一次性写入 stdout
+    print(f"\n{SEP80}")
     print(f"🧪 Tushare北交所股票数据支持测试")
-    print(f"{'='*80}")
+    print(SEP80)
     print(f"测试时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"测试股票: {', '.join(BSE_TEST_STOCKS)}")
     print(f"\n说明:")
     print(f"  本测试使用统一数据访问接口(UnifiedDataAccess)验证Tushare对北交所股票数据的支持")
     print(f"  北交所股票代码通常以8或4开头，转换为ts_code时会加上.BJ后缀")
-    print(f"{'='*80}")
+    print(SEP80)
     
     # 初始化统一数据访问接口
-    fetcher = UnifiedDataAccess()
+    session = _build_session()
+    fetcher = UnifiedDataAccess(session=session)
+    _fetch_stock_info.cache_clear()
     
-    # 运行所有测试
+    # 运行所有测试：各股票同时进行，测试项共用一个线程池（信号量限制在途请求数），结果按原顺序汇总
+    start_date, end_date = _recent_range()
     all_results = []
-    for symbol in BSE_TEST_STOCKS:
-        try:
-            result = run_single_stock_test(symbol, fetcher)
-            all_results.append(result)
-        except Exception as e:
-            print(f"\n❌ 测试股票 {symbol} 时发生异常: {type(e).__name__} - {str(e)}")
-            debug_logger.error("股票测试异常", symbol=symbol, error_type=type(e).__name__, error_message=str(e))
-        finally:
-            print("\n")  # 添加分隔
-    
+    with session, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, \
+            ThreadPoolExecutor(max_workers=len(BSE_TEST_STOCKS)) as stock_pool:
+        pending = [
+            (symbol, stock_pool.submit(run_single_stock_test, symbol, fetcher, executor, start_date, end_date))
+            for symbol in BSE_TEST_STOCKS
+        ]
+        for symbol, future in pending:
+            try:
+                all_results.append(future.result())
+            except Exception as e:
+                _write_lines([f"\n❌ 测试股票 {symbol} 时发生异常: {type(e).__name__} - {str(e)}"])
+                debug_logger.error("股票测试异常", symbol=symbol, error_type=type(e).__name__, error_message=str(e))
+    print("\n")  # 添加分隔
+
     # 打印汇总
     print_summary(all_results)
     
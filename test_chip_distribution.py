@@ -2,14 +2,10 @@
 测试筹码分布数据获取（使用Tushare cyq_perf和cyq_chips接口）
 """
 import sys
-import io
 
-# 设置标准输出编码为UTF-8（Windows兼容）
-if sys.platform == 'win32':
-    try:
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='ignore')
-    except:
-        pass
+# 设置标准输出编码为UTF-8（Windows兼容）：原地重配置，不替换 stdout 对象；也可设置 PYTHONUTF8=1
+if sys.platform == 'win32' and hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(encoding='utf-8', errors='ignore')
 
 from unified_data_access import UnifiedDataAccess
 import traceback
@@ -15,13 +15,88 @@ It will:
 import os
 import sys
 import json
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # 可选依赖：C 实现的 JSON 编解码
+    import orjson
+
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+except ImportError:
+    def _loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, default=str)
+
+try:  # 可选依赖：流式解析 JSON，仅构造需要的前 N 条记录
+    import ijson
+except ImportError:
+    ijson = None
 
 
 BASE_URL = "http://webapi.cninfo.com.cn/api/info/p_info3030"
 
+# Windows 控制台输出中文：原地重配置为 UTF-8（也可设置 PYTHONUTF8=1）
+if sys.platform == "win32":
+    for _stream in (sys.stdout, sys.stderr):
+        if hasattr(_stream, "reconfigure"):
+            _stream.reconfigure(encoding="utf-8", errors="replace")
+
+
+def _build_session() -> requests.Session:
+    """共享的 keep-alive 会话：API 调用与链接探测复用连接，避免每次重新握手。"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    })
+    return session
+
+
+SESSION = _build_session()
+
+# 流式解析时记录所在的路径：{records:[...]}、{data:[...]} 或直接列表
+_RECORD_PREFIXES = ("records.item", "data.item", "item")
+
+
+def _iter_records(raw) -> Iterator[Dict[str, Any]]:
+    """基于 ijson 事件流逐条构造记录对象，不物化整个响应。"""
+    builder = None
+    root = None
+    for prefix, event, value in ijson.parse(raw, use_float=True):
+        if builder is None:
+            if prefix in _RECORD_PREFIXES and event == "start_map":
+                builder, root = ijson.ObjectBuilder(), prefix
+                builder.event(event, value)
+            continue
+        builder.event(event, value)
+        if prefix == root and event == "end_map":
+            yield builder.value
+            builder = None
+
 
 def get_api_key() -> Optional[str]:
     """Get CNINFO_API_KEY from env or prompt user.
@@ -75,13 +150,24 @@ def fetch_news(
     if stype:
         params["stype"] = stype
 
-    resp = requests.get(BASE_URL, params=params, timeout=20)
+    resp = SESSION.get(BASE_URL, params=params, timeout=20, stream=True)
     print("[HTTP]", resp.status_code, resp.url)
-    resp.raise_for_status()
+    try:
+        resp.raise_for_status()
+        content_type = resp.headers.get("Content-Type") or ""
+        if ijson is not None and "json" in content_type:
+            resp.raw.decode_content = True
+            return list(islice(_iter_records(resp.raw), limit))
+        return _parse_records(resp)
+    finally:
+        resp.close()
+
 
+def _parse_records(resp: requests.Response) -> List[Dict[str, Any]]:
+    """非流式解析：整体读取响应后取出记录列表。"""
     # p_info3030 返回格式可能是 {records:[...]} 或直接列表，这里做一下兼容
     try:
-        data = resp.json()
+        data = _loads(resp.content)
     except Exception:
         print("响应不是 JSON，原始内容前 500 字符:\n", resp.text[:500])
         raise
@@ -92,33 +178,50 @@ def fetch_news(
         records = data
     else:
         print("未知响应结构:", type(data))
-        print(json.dumps(data, ensure_ascii=False)[:500])
+        print(_dumps(data)[:500])
         records = []
 
     return records
 
 
+def _probe_link(url: str) -> str:
+    """探测单个链接：优先 HEAD 只取响应头；服务器不支持 HEAD 或未给出长度时，
+    回退为只取 1 字节的 Range GET，从 Content-Range 读取文件总大小，不下载正文。"""
+    try:
+        r = SESSION.head(url, timeout=20, allow_redirects=True)
+        size = r.headers.get("Content-Length")
+        if r.status_code >= 400 or size is None:
+            with SESSION.get(url, headers={"Range": "bytes=0-0"}, timeout=20, stream=True) as r:
+                content_range = r.headers.get("Content-Range") or ""
+                if "/" in content_range:
+                    size = content_range.rsplit("/", 1)[1]
+                else:
+                    size = r.headers.get("Content-Length", "?")
+        return f"  status={r.status_code}, size={size} bytes, content-type={r.headers.get('Content-Type')}"
+    except Exception as e:
+        return f"  请求失败: {e!r}"
+
+
 def test_links(records: List[Dict[str, Any]], max_test: int = 5) -> None:
-    """Try to access F006V / F008V links of first N records."""
-    count = 0
+    """Try to access F006V / F008V links of first N records (probed concurrently)."""
+    targets = []
     for rec in records:
-        if count >= max_test:
+        for label in ("F006V", "F008V"):
+            url = (rec.get(label) or "").strip()
+            if url:
+                targets.append((label, url, rec.get("TEXTID")))
+        if len(targets) >= max_test:
             break
-        url1 = (rec.get("F006V") or "").strip()
-        url2 = (rec.get("F008V") or "").strip()
-        for label, url in (("F006V", url1), ("F008V", url2)):
-            if not url:
-                continue
-            count += 1
-            print(f"\n[TEST] {label} link for TEXTID={rec.get('TEXTID')} -> {url}")
-            try:
-                r = requests.get(url, timeout=20)
-                size = len(r.content or b"")
-                print(f"  status={r.status_code}, size={size} bytes, content-type={r.headers.get('Content-Type')}")
-            except Exception as e:
-                print("  请求失败:", repr(e))
-            if count >= max_test:
-                break
+    targets = targets[:max_test]
+    if not targets:
+        return
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        results = pool.map(_probe_link, [url for _, url, _ in targets])
+        # 结果按原顺序输出
+        for (label, url, textid), line in zip(targets, results):
+            print(f"\n[TEST] {label} link for TEXTID={textid} -> {url}")
+            print(line)
 
 
 def main() -> None:
@@ -157,4 +260,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    with SESSION:
+        main()
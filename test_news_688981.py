@@ -1,5 +1,31 @@
+import pandas as pd
+
 from qstock_news_data import QStockNewsDataFetcher
 
+# 预览字段 -> 候选原始列（按优先级），不同数据源字段名不统一
+PREVIEW_FIELDS = {
+    "title": ("标题", "title"),
+    "time": ("发布时间", "time", "日期"),
+    "source": ("source", "来源"),
+    "content": ("内容", "content"),
+}
+PREVIEW_DEFAULTS = {"title": "<无标题>", "time": "<无时间>", "source": "<未知来源>", "content": ""}
+
+
+def _preview_frame(items, n=5):
+    """取前 n 条新闻，按列一次性完成字段归一（取第一个非空候选列）"""
+    df = pd.DataFrame(items[:n])
+    preview = pd.DataFrame(index=df.index)
+    for field, candidates in PREVIEW_FIELDS.items():
+        values = pd.Series(PREVIEW_DEFAULTS[field], index=df.index, dtype=object)
+        # 低优先级先写，高优先级后覆盖
+        for col in reversed(candidates):
+            if col in df.columns:
+                column = df[col]
+                values = values.mask(column.notna() & column.ne(""), column)
+        preview[field] = values
+    return preview
+
 
 def main():
     fetcher = QStockNewsDataFetcher()
@@ -23,19 +49,17 @@ def main():
 
     items = news_data.get("items", [])
     print("\n=== 前几条新闻预览 ===")
-    for idx, item in enumerate(items[:5], 1):
+    if not items:
+        return
+    for idx, row in enumerate(_preview_frame(items).to_dict("records"), 1):
         print(f"\n--- 新闻 {idx} ---")
-        # 尝试取一些常见字段
-        title = item.get("标题") or item.get("title") or "<无标题>"
-        time = item.get("发布时间") or item.get("time") or item.get("日期") or "<无时间>"
-        src = item.get("source") or item.get("来源") or "<未知来源>"
-        print("来源:", src)
-        print("时间:", time)
-        print("标题:", title)
+        print("来源:", row["source"])
+        print("时间:", row["time"])
+        print("标题:", row["title"])
         # 内容字段可能不统一，打印前 100 字
-        content = item.get("内容") or item.get("content") or ""
+        content = str(row["content"])
         if content:
-            print("内容:", str(content)[:100].replace("\n", " ") + ("..." if len(str(content)) > 100 else ""))
+            print("内容:", content[:100].replace("\n", " ") + ("..." if len(content) > 100 else ""))
 
 
 if __name__ == "__main__":
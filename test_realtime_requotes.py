@@ -2,7 +2,7 @@
 
 1. 调用现有的数据源管理器 `get_realtime_quotes`
 2. 直接调用 Tushare `realtime_quote` 接口
-3. 使用 Akshare `stock_zh_a_spot_em` 接口
+3. 使用 Akshare `stock_bid_ask_em` 单股接口（失败回退 `stock_zh_a_spot_em`）
 
 运行前准备：
 - 确保已在环境变量中设置 `TUSHARE_TOKEN`
@@ -10,13 +10,51 @@
 """
 
 import os
-import json
+import time
 import traceback
+from pathlib import Path
 
 import pandas as pd
 
 from data_source_manager import data_source_manager
 
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        ).decode("utf-8")
+except ImportError:
+    import json
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+
+
+# Tushare 客户端只在模块加载时初始化一次；未设置 token 时不导入 tushare
+TS_TOKEN = os.getenv("TUSHARE_TOKEN")
+_PRO = None
+if TS_TOKEN:
+    try:
+        import tushare as ts
+
+        ts.set_token(TS_TOKEN)
+        _PRO = ts.pro_api()
+    except ImportError:
+        print("未安装 tushare，跳过 Tushare 初始化")
+
+# Akshare 全市场快照本地缓存（60秒内复用，避免每个代码都重新下载全表）
+_SPOT_CACHE_PATH = Path.home() / ".cache" / "akshare" / "spot_zh_a_em.pkl"
+_SPOT_CACHE_TTL = 60
+
+
+def _records_json(df: pd.DataFrame) -> str:
+    """DataFrame 直接序列化为 records JSON（向量化，不经过逐行 dict）"""
+    return df.to_json(orient="records", force_ascii=False, indent=2, date_format="iso")
+
 
 def print_json(title: str, data):
     print("\n" + "=" * 80)
@@ -26,9 +64,14 @@ def print_json(title: str, data):
         print("None")
         return
 
+    # 已序列化的 JSON 字符串直接输出
+    if isinstance(data, str):
+        print(data)
+        return
+
     if isinstance(data, (dict, list)):
         try:
-            print(json.dumps(data, ensure_ascii=False, indent=2, default=str))
+            print(_dumps(data))
             return
         except TypeError:
             pass
@@ -46,45 +89,78 @@ def test_existing_method(symbol: str):
 
 
 def test_tushare_realtime(symbol: str):
-    token = os.getenv("TUSHARE_TOKEN")
-    if not token:
-        print("未检测到 TUSHARE_TOKEN 环境变量，跳过 Tushare 实时行情测试")
+    if _PRO is None:
+        print("未检测到 TUSHARE_TOKEN 环境变量（或未安装 tushare），跳过 Tushare 实时行情测试")
         return
 
     try:
-        import tushare as ts
-
-        ts.set_token(token)
-        pro = ts.pro_api()
-
         ts_code = data_source_manager._convert_to_ts_code(symbol)
-        df = pro.realtime_quote(ts_code=ts_code)
+        df = _PRO.realtime_quote(ts_code=ts_code)
 
         if df is None or df.empty:
             print("Tushare realtime_quote 返回空数据")
             return
 
-        print_json("Tushare realtime_quote 返回数据", df.to_dict(orient="records"))
+        print_json("Tushare realtime_quote 返回数据", _records_json(df))
     except Exception as exc:
         print("Tushare realtime_quote 调用失败:", exc)
         traceback.print_exc()
 
 
+def _load_spot_snapshot() -> pd.DataFrame:
+    """读取 stock_zh_a_spot_em 快照，缓存未过期时直接读本地文件，并按代码建立索引"""
+    try:
+        fresh = time.time() - _SPOT_CACHE_PATH.stat().st_mtime < _SPOT_CACHE_TTL
+    except OSError:
+        fresh = False
+
+    if fresh:
+        return pd.read_pickle(_SPOT_CACHE_PATH)
+
+    import akshare as ak
+
+    df = ak.stock_zh_a_spot_em()
+    if df is None or df.empty:
+        return df
+    # 代码列转为分类类型后建索引：查找走哈希，缓存文件也更小
+    df["代码"] = df["代码"].astype("category")
+    df = df.set_index("代码", drop=False)
+    try:
+        _SPOT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(_SPOT_CACHE_PATH)
+    except OSError as exc:
+        print("写入快照缓存失败:", exc)
+    return df
+
+
 def test_akshare_spot(symbol: str):
+    # 优先走单只股票的盘口接口（KB 级响应），失败再回退到全市场快照过滤
     try:
         import akshare as ak
 
-        df = ak.stock_zh_a_spot_em()
+        bid_ask = ak.stock_bid_ask_em(symbol=symbol)
+        if bid_ask is not None and not bid_ask.empty:
+            print_json(
+                "Akshare stock_bid_ask_em 返回数据（单股盘口，item/value 结构，字段与 spot_em 不同）",
+                _records_json(bid_ask),
+            )
+            return
+        print("Akshare stock_bid_ask_em 返回空数据，回退 stock_zh_a_spot_em")
+    except Exception as exc:
+        print("Akshare stock_bid_ask_em 调用失败，回退 stock_zh_a_spot_em:", exc)
+
+    try:
+        df = _load_spot_snapshot()
         if df is None or df.empty:
             print("Akshare stock_zh_a_spot_em 返回空数据")
             return
 
-        stock_df = df[df["代码"] == symbol]
+        stock_df = df.loc[[symbol]] if symbol in df.index else df.iloc[0:0]
         if stock_df.empty:
             print(f"Akshare 数据中未找到股票 {symbol}")
             return
 
-        print_json("Akshare stock_zh_a_spot_em 返回数据", stock_df.to_dict(orient="records"))
+        print_json("Akshare stock_zh_a_spot_em 返回数据", _records_json(stock_df))
     except Exception as exc:
         print("Akshare stock_zh_a_spot_em 调用失败:", exc)
         traceback.print_exc()
@@ -3,6 +3,7 @@
 """
 测试研报内容获取，检查Tushare report_rc接口的字段
 """
+import re
 import sys
 import io
 
@@ -12,9 +13,14 @@ if sys.platform == 'win32':
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
 from data_source_manager import data_source_manager
+from tushare_test_cache import cached_report_rc, parse_cache_flag
 from datetime import datetime, timedelta
 import pandas as pd
 
+# 列名中可能表示正文/摘要的关键词
+_CONTENT_PAT = re.compile(r'content|text|abstract|summary|desc|note')
+
+
 def test_report_rc_fields(symbol='603197'):
     """测试report_rc接口的返回字段"""
     print("=" * 60)
@@ -38,7 +44,8 @@ def test_report_rc_fields(symbol='603197'):
         
         # 获取数据
         print(f"\n[3] 调用 report_rc 接口...")
-        df_reports = data_source_manager.tushare_api.report_rc(
+        df_reports = cached_report_rc(
+            data_source_manager.tushare_api,
             ts_code=ts_code,
             start_date=start_date,
             end_date=end_date
@@ -70,12 +77,11 @@ def test_report_rc_fields(symbol='603197'):
         
         # 检查是否有类似内容的字段
         print(f"\n[6] 检查可能的内容字段:")
-        content_like_cols = [col for col in df_reports.columns if 
-                           any(keyword in col.lower() for keyword in ['content', 'text', 'abstract', 'summary', 'desc', 'note'])]
+        content_like_cols = [col for col in df_reports.columns if _CONTENT_PAT.search(str(col).lower())]
         if content_like_cols:
             print(f"   找到可能的内容字段: {content_like_cols}")
-            for col in content_like_cols:
-                non_null_count = df_reports[col].notna().sum()
+            non_null_counts = df_reports[content_like_cols].notna().sum()
+            for col, non_null_count in non_null_counts.items():
                 print(f"   - {col}: {non_null_count}/{len(df_reports)} 条非空")
         else:
             print("   ⚠️ 未找到明显的内容字段")
@@ -91,5 +97,6 @@ def test_report_rc_fields(symbol='603197'):
 
 
 if __name__ == '__main__':
+    parse_cache_flag()  # --no-cache 跳过本地缓存
     test_report_rc_fields('603197')
 
@@ -13,8 +13,18 @@ if sys.platform == 'win32':
 
 from unified_data_access import unified_data_access
 from datetime import datetime
+from itertools import compress
 import pandas as pd
 
+# 判定重复研报的字段组合
+DEDUP_KEYS = ['日期', '机构名称', '研报标题']
+
+def _top_counts(column: pd.Series, n: int = 5) -> dict:
+    """统计列中非空取值的出现次数，返回前 n 项"""
+    values = column.dropna().astype(str).str.strip()
+    return values[values.ne('')].value_counts().head(n).to_dict()
+
+
 def test_research_reports(symbol='603197'):
     """测试研报数据获取"""
     print("=" * 60)
@@ -44,25 +54,14 @@ def test_research_reports(symbol='603197'):
     
     print(f"   - 原始研报数量: {len(reports)}")
     
-    # 使用标题+日期+机构作为唯一标识
-    seen = set()
-    duplicates = []
-    unique_reports = []
-    
-    for report in reports:
-        title = report.get('研报标题', '')
-        date = report.get('日期', '')
-        org = report.get('机构名称', '')
-        key = f"{date}_{org}_{title}"
-        
-        if key in seen:
-            duplicates.append(report)
-        else:
-            seen.add(key)
-            unique_reports.append(report)
+    # 使用标题+日期+机构作为唯一标识：一次构造 DataFrame，由 duplicated 做哈希去重
+    keys = pd.DataFrame(reports).reindex(columns=DEDUP_KEYS).fillna('')
+    mask_dup = keys.duplicated(keep='first').to_numpy()
+    unique_reports = list(compress(reports, ~mask_dup))
+    duplicates = list(compress(reports, mask_dup))
     
     print(f"   - 去重后数量: {len(unique_reports)}")
-    print(f"   - 重复数量: {len(duplicates)}")
+    print(f"   - 重复数量: {int(mask_dup.sum())}")
     
     if duplicates:
         print(f"\n   发现重复研报:")
@@ -71,21 +70,23 @@ def test_research_reports(symbol='603197'):
     
     # 检查研报内容
     print(f"\n[4] 检查研报内容获取...")
-    reports_with_content = [r for r in unique_reports if r.get('研报内容') and r.get('研报内容').strip()]
-    reports_with_summary = [r for r in unique_reports if r.get('内容摘要') and r.get('内容摘要').strip()]
+    # 去重结果构造一次 DataFrame，各筛选用列级布尔掩码完成
+    udf = pd.DataFrame(unique_reports).reindex(columns=['日期', '机构名称', '研报标题', '评级', '研报内容', '内容摘要'])
+    content = udf['研报内容'].fillna('').astype(str)
+    has_content = content.str.strip().ne('')
+    has_summary = udf['内容摘要'].fillna('').astype(str).str.strip().ne('')
     
-    print(f"   - 包含完整内容的研报: {len(reports_with_content)}")
-    print(f"   - 包含内容摘要的研报: {len(reports_with_summary)}")
+    print(f"   - 包含完整内容的研报: {int(has_content.sum())}")
+    print(f"   - 包含内容摘要的研报: {int(has_summary.sum())}")
     
-    if reports_with_content:
+    if has_content.any():
         print(f"\n   前3条包含内容的研报:")
-        for idx, report in enumerate(reports_with_content[:3], 1):
-            content = report.get('研报内容', '')
-            content_length = len(content)
-            print(f"     {idx}. [{report.get('日期', '')}] {report.get('研报标题', '')}")
-            print(f"        机构: {report.get('机构名称', '')}")
-            print(f"        内容长度: {content_length} 字符")
-            print(f"        内容预览: {content[:100]}...")
+        preview = udf.loc[has_content, ['日期', '研报标题', '机构名称']].fillna('').assign(内容=content[has_content]).head(3)
+        for idx, (date, title, org, text) in enumerate(preview.itertuples(index=False, name=None), 1):
+            print(f"     {idx}. [{date}] {title}")
+            print(f"        机构: {org}")
+            print(f"        内容长度: {len(text)} 字符")
+            print(f"        内容预览: {text[:100]}...")
     else:
         print("   ⚠️ 没有获取到研报内容")
     
@@ -112,19 +113,19 @@ def test_research_reports(symbol='603197'):
     
     # 显示统计分析摘要
     print(f"\n[6] 统计分析摘要...")
-    summary = research_data.get('analysis_summary', {})
-    if summary:
-        rating_dist = summary.get('rating_distribution', {})
-        if rating_dist:
-            print(f"   - 评级分布:")
-            for rating, count in list(rating_dist.items())[:5]:
-                print(f"     {rating}: {count}")
-        
-        top_orgs = summary.get('top_institutions', {})
-        if top_orgs:
-            print(f"   - Top机构 (前5):")
-            for org, count in list(top_orgs.items())[:5]:
-                print(f"     {org}: {count}条研报")
+    summary = research_data.get('analysis_summary') or {}
+    # 数据源未给出分布时（如 Akshare），直接在去重后的研报上 value_counts 统计
+    rating_dist = summary.get('rating_distribution') or _top_counts(udf['评级'])
+    if rating_dist:
+        print(f"   - 评级分布:")
+        for rating, count in list(rating_dist.items())[:5]:
+            print(f"     {rating}: {count}")
+    
+    top_orgs = summary.get('top_institutions') or _top_counts(udf['机构名称'])
+    if top_orgs:
+        print(f"   - Top机构 (前5):")
+        for org, count in list(top_orgs.items())[:5]:
+            print(f"     {org}: {count}条研报")
     
     print("\n" + "=" * 60)
     print("测试完成")
@@ -1,11 +1,34 @@
 import os
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Iterable
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = os.environ.get("TDX_API_BASE", "http://localhost:8080")
+MAX_CONCURRENCY = 10
+_PRINT_LOCK = threading.Lock()
+
+# 所有接口探测复用同一个 keep-alive 会话（同一主机，单连接池）
+_SESSION = requests.Session()
+_SESSION.mount(
+    BASE_URL.split("://", 1)[0] + "://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    ),
+)
+
+
+def _log(message: str) -> None:
+    """并发探测时整行输出，避免多线程打印交错"""
+    with _PRINT_LOCK:
+        print(message)
 
 
 def call_api(path: str, params: Dict[str, Any] | None = None, method: str = "GET", json_body: Dict[str, Any] | None = None) -> Dict[str, Any]:
@@ -13,17 +36,17 @@ def call_api(path: str, params: Dict[str, Any] | None = None, method: str = "GET
     url = f"{BASE_URL.rstrip('/')}{path}"
     try:
         if method.upper() == "POST":
-            resp = requests.post(url, params=params, json=json_body, timeout=10)
+            resp = _SESSION.post(url, params=params, json=json_body, timeout=10)
         else:
-            resp = requests.get(url, params=params, timeout=10)
+            resp = _SESSION.get(url, params=params, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         code = data.get("code") if isinstance(data, dict) else None
         message = data.get("message") if isinstance(data, dict) else None
         if code == 0:
-            print(f"✅ {path} -> code=0 message={message}")
+            _log(f"✅ {path} -> code=0 message={message}")
         else:
-            print(f"⚠️ {path} -> code={code} message={message}")
+            _log(f"⚠️ {path} -> code={code} message={message}")
         return data
     except requests.exceptions.HTTPError as exc:
         response = exc.response
@@ -36,13 +59,13 @@ def call_api(path: str, params: Dict[str, Any] | None = None, method: str = "GET
             except Exception:
                 raw_message = response.text[:200]
         if raw_message:
-            print(f"❌ {path} 请求失败: {raw_message}")
+            _log(f"❌ {path} 请求失败: {raw_message}")
         else:
-            print(f"❌ {path} 请求失败: {exc}")
+            _log(f"❌ {path} 请求失败: {exc}")
     except requests.exceptions.RequestException as exc:
-        print(f"❌ {path} 请求失败: {exc}")
+        _log(f"❌ {path} 请求失败: {exc}")
     except json.JSONDecodeError:
-        print(f"❌ {path} 返回非JSON数据: {resp.text[:200]}")
+        _log(f"❌ {path} 返回非JSON数据: {resp.text[:200]}")
     return {}
 
 
@@ -169,33 +192,44 @@ def show_batch_quote(resp: Dict[str, Any]) -> None:
 def main() -> None:
     print(f"测试 TDX API，基础地址: {BASE_URL}")
 
-    # 单只股票行情
-    quote_resp = call_api("/api/quote", {"code": "000001"})
-    show_quote_details(quote_resp)
-
-    # 额外测试另一只股票行情
-    show_quote_details(call_api("/api/quote", {"code": "600519"}), label="600519")
-
-    kline_resp = call_api("/api/kline", {"code": "000001", "type": "day"})
-    show_kline_summary(kline_resp, label="实时K线")
-
     today = datetime.now().strftime("%Y%m%d")
-    show_intraday_summary(call_api("/api/minute", {"code": "000001", "date": today}), "分时数据")
-    show_intraday_summary(call_api("/api/trade", {"code": "000001", "date": today}), "逐笔成交")
-
-    show_search_results(call_api("/api/search", {"keyword": "平安"}))
-    show_stock_info(call_api("/api/stock-info", {"code": "000001"}))
+    # 各接口相互独立：先并发发出全部请求，再按原顺序展示结果
+    probes = {
+        "quote": (("/api/quote", {"code": "000001"}), {}),
+        "quote_600519": (("/api/quote", {"code": "600519"}), {}),
+        "kline": (("/api/kline", {"code": "000001", "type": "day"}), {}),
+        "minute": (("/api/minute", {"code": "000001", "date": today}), {}),
+        "trade": (("/api/trade", {"code": "000001", "date": today}), {}),
+        "search": (("/api/search", {"keyword": "平安"}), {}),
+        "stock_info": (("/api/stock-info", {"code": "000001"}), {}),
+        "codes": (("/api/codes", {"exchange": "sh"}), {}),
+        "batch_quote": (("/api/batch-quote",), {"method": "POST", "json_body": {"codes": ["000001", "600519", "601318"]}}),
+        "kline_history": (("/api/kline-history", {"code": "000001", "type": "day", "limit": 30}), {}),
+        "index": (("/api/index", {"code": "sh000001", "type": "day"}), {}),
+    }
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as pool:
+        futures = {name: pool.submit(call_api, *args, **kwargs) for name, (args, kwargs) in probes.items()}
+        results = {name: future.result() for name, future in futures.items()}
+
+    show_quote_details(results["quote"])
+    show_quote_details(results["quote_600519"], label="600519")
+    show_kline_summary(results["kline"], label="实时K线")
+    show_intraday_summary(results["minute"], "分时数据")
+    show_intraday_summary(results["trade"], "逐笔成交")
+    show_search_results(results["search"])
+    show_stock_info(results["stock_info"])
     try:
-        show_code_list(call_api("/api/codes", {"exchange": "sh"}))
+        show_code_list(results["codes"])
     except Exception as exc:
         print(f"⚠️ /api/codes 处理失败: {exc}")
     try:
-        show_batch_quote(call_api("/api/batch-quote", method="POST", json_body={"codes": ["000001", "600519", "601318"]}))
+        show_batch_quote(results["batch_quote"])
     except Exception as exc:
         print(f"⚠️ /api/batch-quote 处理失败: {exc}")
-    show_kline_summary(call_api("/api/kline-history", {"code": "000001", "type": "day", "limit": 30}), label="历史K线")
-    show_kline_summary(call_api("/api/index", {"code": "sh000001", "type": "day"}), label="指数K线")
+    show_kline_summary(results["kline_history"], label="历史K线")
+    show_kline_summary(results["index"], label="指数K线")
 
 
 if __name__ == "__main__":
-    main()
+    with _SESSION:
+        main()
@@ -8,14 +8,30 @@
 import sys
 import io
 from datetime import datetime, timedelta, time
+from functools import lru_cache
 from unified_data_access import unified_data_access
 
 # Windows控制台UTF-8编码支持
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+# 本脚本内的交易日判断按日期记忆化：同一日期在本次测试中只判断一次
+# 只在本脚本中直接调用，不替换共享实例 unified_data_access 上的方法
+@lru_cache(maxsize=512)
+def _cached_is_trading_day(ymd: str) -> bool:
+    return unified_data_access._is_trading_day(datetime.strptime(ymd, '%Y%m%d'))
+
+
+def _is_trading_day(date: datetime = None) -> bool:
+    return _cached_is_trading_day((date or datetime.now()).strftime('%Y%m%d'))
+
+_WEEKDAYS = ('周一', '周二', '周三', '周四', '周五', '周六', '周日')
+
+
 def test_trade_date_selection():
     """测试交易日选择逻辑"""
+    # 整个测试只取一次当前时间，避免跨零点时前后判断不一致
+    now = datetime.now()
     print("=" * 60)
     print("测试交易日选择逻辑")
     print("=" * 60)
@@ -54,8 +70,8 @@ def test_trade_date_selection():
         }
     ]
     
-    print(f"\n当前时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"当前星期: {['周一', '周二', '周三', '周四', '周五', '周六', '周日'][datetime.now().weekday()]}")
+    print(f"\n当前时间: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"当前星期: {_WEEKDAYS[now.weekday()]}")
     
     # 测试交易日判断
     print(f"\n{'=' * 60}")
@@ -63,9 +79,9 @@ def test_trade_date_selection():
     print(f"{'=' * 60}")
     
     for i in range(7):
-        test_date = datetime.now() - timedelta(days=i)
-        is_trading = unified_data_access._is_trading_day(test_date)
-        weekday_name = ['周一', '周二', '周三', '周四', '周五', '周六', '周日'][test_date.weekday()]
+        test_date = now - timedelta(days=i)
+        is_trading = _is_trading_day(test_date)
+        weekday_name = _WEEKDAYS[test_date.weekday()]
         status = "✅ 交易日" if is_trading else "❌ 非交易日"
         print(f"  {test_date.strftime('%Y-%m-%d')} ({weekday_name}): {status}")
     
@@ -74,11 +90,11 @@ def test_trade_date_selection():
     print("测试交易时间判断方法")
     print(f"{'=' * 60}")
     
-    is_trading_day = unified_data_access._is_trading_day()
+    is_trading_day = _is_trading_day(now)
     is_trading_time = unified_data_access._is_trading_time()
-    current_time = datetime.now().time()
+    current_time = now.time()
     
-    print(f"  当前日期: {datetime.now().strftime('%Y-%m-%d')}")
+    print(f"  当前日期: {now.strftime('%Y-%m-%d')}")
     print(f"  当前时间: {current_time.strftime('%H:%M:%S')}")
     print(f"  是否为交易日: {'✅ 是' if is_trading_day else '❌ 否'}")
     print(f"  是否在交易时间: {'✅ 是' if is_trading_time else '❌ 否'}")
@@ -90,15 +106,14 @@ def test_trade_date_selection():
     
     selected_date = unified_data_access._get_appropriate_trade_date()
     selected_datetime = datetime.strptime(selected_date, '%Y%m%d')
-    selected_weekday = ['周一', '周二', '周三', '周四', '周五', '周六', '周日'][selected_datetime.weekday()]
+    selected_weekday = _WEEKDAYS[selected_datetime.weekday()]
     
     print(f"  选择的交易日: {selected_date} ({selected_weekday})")
     print(f"  选择的日期: {selected_datetime.strftime('%Y-%m-%d')}")
     
     # 解释选择逻辑
-    now = datetime.now()
     current_time = now.time()
-    is_trading_day = unified_data_access._is_trading_day()
+    is_trading_day = _is_trading_day(now)
     is_trading_time = unified_data_access._is_trading_time()
     is_before_open = current_time < time(9, 30)
     
@@ -1,7 +1,9 @@
 import pathlib
-import re
 
 import tushare as ts
+from dotenv import dotenv_values
+
+from tushare_test_cache import cached_call, parse_cache_flag
 
 
 def load_token_from_env_file() -> str | None:
@@ -9,12 +11,11 @@ def load_token_from_env_file() -> str | None:
     if not env_path.exists():
         print(".env file not found in project root")
         return None
-    text = env_path.read_text(encoding="utf-8")
-    m = re.search(r"^TUSHARE_TOKEN=(.+)$", text, re.M)
-    if not m:
+    token = dotenv_values(env_path).get("TUSHARE_TOKEN")
+    if token is None:
         print("TUSHARE_TOKEN not found in .env")
         return None
-    token = m.group(1).strip().strip('"').strip("'")
+    token = token.strip().strip('"').strip("'")
     return token or None
 
 
@@ -29,7 +30,9 @@ def main():
 
     try:
         # 按照官方文档示例：仅通过日期区间获取重要新闻
-        df = pro.major_news(
+        df = cached_call(
+            "major_news",
+            pro.major_news,
             start_date="20240101",
             end_date="20241231",
             limit=5,
@@ -44,4 +47,5 @@ def main():
 
 
 if __name__ == "__main__":
+    parse_cache_flag()  # --no-cache 跳过本地缓存
     main()
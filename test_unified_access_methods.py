@@ -22,6 +22,8 @@ def test_methods():
     print("=" * 80)
     
     unified = UnifiedDataAccess()
+    # 一次性取出实例可见的属性名，后续检查只做集合成员判断
+    available = frozenset(dir(unified))
     
     # 需要的方法列表（根据app.py的调用）
     required_methods = [
@@ -40,13 +42,12 @@ def test_methods():
     print("\n检查必需方法:")
     print("-" * 80)
     
-    all_ok = True
+    missing = [m for m in required_methods if m not in available]
+    all_ok = not missing
     for method_name in required_methods:
-        has_method = hasattr(unified, method_name)
+        has_method = method_name in available
         status = "✅" if has_method else "❌"
         print(f"{status} {method_name:<30} {'存在' if has_method else '缺失'}")
-        if not has_method:
-            all_ok = False
     
     print("-" * 80)
     
@@ -62,15 +63,16 @@ def test_methods():
             'get_latest_indicators'
         ]
         
+        fetcher_attrs = frozenset(dir(unified.stock_data_fetcher))
         for method_name in fetcher_methods:
-            has_method = hasattr(unified.stock_data_fetcher, method_name)
+            has_method = method_name in fetcher_attrs
             status = "✅" if has_method else "❌"
             print(f"{status} stock_data_fetcher.{method_name:<30} {'存在' if has_method else '缺失'}")
         
         print("-" * 80)
         print("\n✅ 所有方法检查完成！")
     else:
-        print("\n❌ 有方法缺失，请补充！")
+        print(f"\n❌ 有方法缺失，请补充: {', '.join(missing)}")
         return False
     
     print("\n" + "=" * 80)
@@ -1,6 +1,10 @@
 import requests
 import re
 
+_DL_RE = re.compile(r"downloadPdf\('([^']+)'\)")
+_PDF_RE = re.compile(r"https?://static\.cninfo\.com\.cn/[^\"'<>]+\.PDF", re.I)
+CHUNK_SIZE = 1 << 16
+
 detail_url = (
     "https://www.cninfo.com.cn/new/disclosure/detail"
     "?stockCode=688981"
@@ -17,24 +21,29 @@ print("detail status:", resp.status_code)
 html = resp.text
 
 download_url = None
-match = re.search(r"downloadPdf\('([^']+)'\)", html)
+match = _DL_RE.search(html)
 if match:
     download_url = match.group(1)
 print("download url:", download_url)
 
 if not download_url:
-    match = re.search(r"https?://static\.cninfo\.com\.cn/[^\"'<>]+\.PDF", html, re.I)
+    match = _PDF_RE.search(html)
     if match:
         download_url = match.group(0)
     print("fallback url:", download_url)
 
 if download_url:
     headers["Referer"] = detail_url
-    resp = session.get(download_url, headers=headers, timeout=20)
-    print("download status:", resp.status_code)
-    print("content-type:", resp.headers.get("Content-Type"))
-    print("content length:", len(resp.content))
-    with open("test.pdf", "wb") as f:
-        f.write(resp.content)
+    # 流式写盘：内存中只保留一个分块
+    with session.get(download_url, headers=headers, timeout=20, stream=True) as resp:
+        print("download status:", resp.status_code)
+        print("content-type:", resp.headers.get("Content-Type"))
+        size = 0
+        with open("test.pdf", "wb") as f:
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    size += len(chunk)
+    print("content length:", size)
 else:
     print("未找到下载链接")
@@ -1,12 +1,16 @@
 from data_source_manager import data_source_manager
 from network_optimizer import network_optimizer
+from tushare_test_cache import cached_call, parse_cache_flag
 import requests
+from concurrent.futures import ThreadPoolExecutor
 
 def test_announcements(symbol: str):
     ts_code = data_source_manager._convert_to_ts_code(symbol)
     print(f"ts_code: {ts_code}")
     with network_optimizer.apply():
-        df = data_source_manager.tushare_api.anns_d(
+        df = cached_call(
+            'anns_d',
+            data_source_manager.tushare_api.anns_d,
             ts_code=ts_code,
             start_date='20250101',
             end_date='20251231',
@@ -18,25 +22,39 @@ def test_announcements(symbol: str):
         print('No announcement data found.')
         return
     print(df[['ann_date','title','pdf_url','file_url','url','src','org_id','announcement_id','announcement_type']])
-    for idx, row in df.head(5).iterrows():
-        print(f"\n-- Announcement {idx} --")
-        for key in ['pdf_url','file_url','url','src','adjunct_url']:
-            value = row.get(key)
-            if isinstance(value, str) and value.strip():
-                candidate = value.strip()
-                break
-        else:
-            candidate = None
-        print('Candidate URL:', candidate)
-        if not candidate:
-            continue
+    # 只取 URL 候选列转为数组，逐行取第一个非空值（避免 iterrows 为每行构造 Series）
+    url_cols = ['pdf_url', 'file_url', 'url', 'src', 'adjunct_url']
+    head = df.head(5)
+    url_frame = head.reindex(columns=url_cols)
+    # 只有字符串才能作为候选链接；NaN/None/数值等一律置空，避免 astype(str) 产生 "nan" 之类的假链接
+    is_text = url_frame.apply(lambda col: col.map(lambda v: isinstance(v, str)))
+    url_values = url_frame.where(is_text, '').to_numpy()
+    candidates = [next((v.strip() for v in row_vals if v.strip()), None) for row_vals in url_values]
+
+    # 各候选链接并发校验，结果按原顺序输出；单个失败不影响其他
+    session = requests.Session()
+
+    def _fetch(url):
+        if not url:
+            return None, None
         try:
-            resp = requests.get(candidate, timeout=20, allow_redirects=True)
+            return session.get(url, timeout=20, allow_redirects=True), None
+        except Exception as e:
+            return None, e
+
+    with session, ThreadPoolExecutor(max_workers=5) as ex:
+        for idx, candidate, (resp, error) in zip(head.index, candidates, ex.map(_fetch, candidates)):
+            print(f"\n-- Announcement {idx} --")
+            print('Candidate URL:', candidate)
+            if not candidate:
+                continue
+            if error is not None:
+                print('Download failed:', error)
+                continue
             print('Status:', resp.status_code, 'Content-Type:', resp.headers.get('Content-Type'))
             print('Final URL:', resp.url)
             print('Head bytes:', resp.content[:12])
-        except Exception as e:
-            print('Download failed:', e)
 
 if __name__ == '__main__':
+    parse_cache_flag()  # --no-cache 跳过本地缓存
     test_announcements('300073')
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+测试脚本用的接口响应磁盘缓存（Tushare / AKShare / 统一数据访问接口）
+
+同参数重复运行测试时直接读取本地文件，不再消耗接口额度。
+结果以 pickle 落盘，旁边的 .meta.json 记录抓取时间、参数与 tushare 版本，便于复现。
+"""
+import argparse
+import hashlib
+import json
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+import pandas as pd
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "tushare"
+DEFAULT_TTL = 24 * 3600
+
+_enabled = True
+
+
+def _tushare_version() -> Optional[str]:
+    try:
+        from importlib.metadata import version
+        return version("tushare")
+    except Exception:
+        return None
+
+
+def parse_cache_flag(argv=None) -> bool:
+    """解析 --no-cache 命令行参数（忽略其他参数），返回是否启用缓存"""
+    global _enabled
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--no-cache", action="store_true")
+    args, _ = parser.parse_known_args(argv)
+    _enabled = not args.no_cache
+    return _enabled
+
+
+def _is_empty(result: Any) -> bool:
+    if result is None:
+        return True
+    if isinstance(result, pd.DataFrame):
+        return result.empty
+    return isinstance(result, (dict, list, tuple)) and not result
+
+
+def cached_fetch(endpoint: str, fn: Callable[..., Any], ttl: int = DEFAULT_TTL, **kwargs) -> Tuple[Any, Optional[float]]:
+    """按 (接口名, 参数) 缓存调用结果，返回 (结果, 缓存写入时间)；未命中时第二项为 None
+
+    空结果多为临时失败，不写入缓存。本函数不打印，调用方可据返回的时间自行标注“来自缓存”。
+    """
+    if not _enabled:
+        return fn(**kwargs), None
+
+    key = json.dumps({"endpoint": endpoint, "kwargs": kwargs}, sort_keys=True, default=str)
+    digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+    data_path = CACHE_DIR / endpoint / f"{digest}.pkl"
+    meta_path = data_path.with_suffix(".meta.json")
+
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if time.time() - meta["ts"] < ttl:
+            with open(data_path, "rb") as f:
+                return pickle.load(f), meta["ts"]
+    except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError):
+        pass
+
+    result = fn(**kwargs)
+    if not _is_empty(result):
+        try:
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(data_path, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            meta_path.write_text(
+                json.dumps(
+                    {"ts": time.time(), "ttl": ttl, "endpoint": endpoint, "kwargs": kwargs,
+                     "tushare_version": _tushare_version()},
+                    ensure_ascii=False, default=str,
+                ),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            print(f"[cache] 写入缓存失败: {e}")
+    return result, None
+
+
+def format_hit(endpoint: str, ts: float) -> str:
+    return f"[cache] {endpoint} 命中本地缓存 ({time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))})，未请求接口；--no-cache 可强制重新请求"
+
+
+def cached_call(endpoint: str, fn: Callable[..., Any], ttl: int = DEFAULT_TTL, **kwargs) -> Any:
+    """按 (接口名, 参数) 缓存调用结果；命中时打印提示，空结果不缓存"""
+    result, ts = cached_fetch(endpoint, fn, ttl, **kwargs)
+    if ts is not None:
+        print(format_hit(endpoint, ts))
+    return result
+
+
+def cached_report_rc(api, ts_code: str, start_date: str, end_date: str, **kwargs) -> pd.DataFrame:
+    """缓存版 report_rc（券商盈利预测/研报）"""
+    return cached_call(
+        "report_rc", api.report_rc, ts_code=ts_code, start_date=start_date, end_date=end_date, **kwargs
+    )
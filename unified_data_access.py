@@ -24,8 +24,13 @@ class UnifiedDataAccess:
     - 预留研报/公告/筹码等接口（先返回占位结构，后续由数据源补齐）
     """
 
-    def __init__(self):
-        """初始化统一数据访问模块"""
+    def __init__(self, session: Optional[requests.Session] = None):
+        """初始化统一数据访问模块
+
+        Args:
+            session: 可选的 requests.Session（连接池复用）；不传时沿用模块级 requests 调用
+        """
+        self._http = session if session is not None else requests
         # 导入StockDataFetcher以兼容旧代码（用于计算技术指标）
         from stock_data import StockDataFetcher
         self.stock_data_fetcher = StockDataFetcher()
@@ -703,7 +708,7 @@ class UnifiedDataAccess:
         try:
             url = self._tdx_api_base.rstrip("/") + "/api/minute"
             params = {"code": code, "date": trade_date}
-            resp = requests.get(url, params=params, timeout=5)
+            resp = self._http.get(url, params=params, timeout=5)
             resp.raise_for_status()
             payload = resp.json()
             if not isinstance(payload, dict) or payload.get("code") != 0:
@@ -1221,7 +1226,7 @@ class UnifiedDataAccess:
                     }
                     cookies_em = _em_cookies()
                     # 不通过代理池，直接请求东财 PDF 服务器
-                    response = requests.get(
+                    response = self._http.get(
                         url,
                         headers=headers_em,
                         cookies=cookies_em,
@@ -1278,7 +1283,7 @@ class UnifiedDataAccess:
                             f"?plate=&orgId={org_id}&stockCode=&announcementId={ann_id}&lang=zh"
                         )
                         with network_optimizer.apply():
-                            api_resp = requests.get(api_url, headers=headers, timeout=25, allow_redirects=True)
+                            api_resp = self._http.get(api_url, headers=headers, timeout=25, allow_redirects=True)
                         if api_resp.status_code == 200:
                             api_text = api_resp.text
                             pdf_match_api = re.search(r"https?://static\\.cninfo\\.com\\.cn/[^\\\"'<>]+\\.pdf", api_text, re.I)
@@ -1358,7 +1363,7 @@ class UnifiedDataAccess:
                     "f_node": "0",
                     "stock_list": _clean_symbol(code),
                 }
-                resp = requests.get(base_url, params=params, headers=headers_list, timeout=15)
+                resp = self._http.get(base_url, params=params, headers=headers_list, timeout=15)
                 resp.raise_for_status()
                 payload = resp.json() or {}
                 return payload.get("data", {}).get("list", []) or []
@@ -1373,7 +1378,7 @@ class UnifiedDataAccess:
                     "Accept": "application/json,text/plain,*/*",
                 }
                 try:
-                    resp = requests.get(
+                    resp = self._http.get(
                         content_api,
                         params=params,
                         headers=headers_detail,